@@ -6,24 +6,25 @@ for a particular language ecosystem.
 """
 
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from pathlib import Path
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NamespaceInfo:
     """Structural info about a single namespace/module."""
 
     path: str
     name: str
     requires: list[str]
-    functions: list[str]
+    functions: Sequence[str]
     layer: str | None
     has_side_effects: bool
     metadata: dict = field(default_factory=dict)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class StructureResult:
     """Complete structural extraction result for a project."""
 
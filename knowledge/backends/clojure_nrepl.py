@@ -6,8 +6,12 @@ When nREPL is NOT available: falls back to static file parsing.
 
 from __future__ import annotations
 
+import functools
 import logging
+import os
 import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from knowledge.backends.base import LanguageBackend, NamespaceInfo, StructureResult
@@ -34,6 +38,9 @@ _REQUIRE_BLOCK_RE = re.compile(
     re.DOTALL,
 )
 
+_REQUIRE_BRACKET_RE = re.compile(r"\[\s*([\w.*+!\-'?<>=/.]+)")
+_REQUIRE_BARE_RE = re.compile(r"(?<!\[)\b([\w]+(?:\.[\w.*+!\-'?<>=]+)+)\b")
+
 _DEFN_RE = re.compile(r"\(defn-?\s+([\w.*+!\-'?<>=/.]+)")
 
 _DEFMETHOD_RE = re.compile(
@@ -45,6 +52,9 @@ _DEFMULTI_RE = re.compile(r"\(defmulti\s+([\w.*+!\-'?<>=/.]+)")
 
 _CLJ_EXTENSIONS: frozenset[str] = frozenset({".clj", ".cljc"})
 
+# Source reads are I/O-bound, so the pool can be wider than the core count.
+_MAX_READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
 
 class ClojureNREPLBackend(LanguageBackend):
     """Clojure nREPL backend with static-parse fallback."""
@@ -102,11 +112,14 @@ class ClojureNREPLBackend(LanguageBackend):
         dependency_map: dict[str, list[str]] = {}
         total_chars = 0
 
-        for file_path in source_files:
-            try:
-                source = file_path.read_text(encoding="utf-8")
-            except (OSError, UnicodeDecodeError) as exc:
-                logger.warning("Skipping unreadable file %s: %s", file_path, exc)
+        # Reads run on a thread pool (the GIL is released during read());
+        # parsing stays serial since it is CPU-bound.
+        max_workers = min(_MAX_READ_WORKERS, len(source_files))
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            sources = list(pool.map(_read_source, source_files))
+
+        for file_path, source in zip(source_files, sources):
+            if source is None:
                 continue
 
             total_chars += len(source)
@@ -152,14 +165,8 @@ class ClojureNREPLBackend(LanguageBackend):
         )
 
     def _parse_ns_form(self, source: str) -> tuple[str | None, list[str]]:
-        ns_match = _NS_FORM_RE.search(source)
-        if ns_match is None:
-            return None, []
-
-        ns_name = ns_match.group(1)
-        ns_region = _extract_ns_region(source)
-        requires = _parse_requires(ns_region)
-        return ns_name, requires
+        ns_name, requires = _parse_ns_form_cached(source)
+        return ns_name, list(requires)
 
     def _classify_diplomat_layer(self, namespace_name: str, file_path: str) -> str | None:
         for segment in namespace_name.split("."):
@@ -175,17 +182,20 @@ class ClojureNREPLBackend(LanguageBackend):
         return any(marker in source_lower for marker in _SIDE_EFFECT_MARKERS)
 
 
+def _read_source(file_path: Path) -> str | None:
+    try:
+        return file_path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError) as exc:
+        logger.warning("Skipping unreadable file %s: %s", file_path, exc)
+        return None
+
+
 def _detect_nrepl_port(project_dir: Path) -> int | None:
     search_dir = project_dir
     for _ in range(4):
-        port_file = search_dir / ".nrepl-port"
-        if port_file.is_file():
-            try:
-                port = int(port_file.read_text(encoding="utf-8").strip())
-                if 1 <= port <= 65535:
-                    return port
-            except (ValueError, OSError):
-                pass
+        port = _read_port_file(os.path.join(search_dir, ".nrepl-port"))
+        if port is not None:
+            return port
         parent = search_dir.parent
         if parent == search_dir:
             break
@@ -193,20 +203,62 @@ def _detect_nrepl_port(project_dir: Path) -> int | None:
     return None
 
 
+def _read_port_file(port_path: str) -> int | None:
+    # Port files hold a few ASCII digits; a raw os.read skips the text-IO and
+    # codec setup of Path.read_text on every availability probe.
+    try:
+        fd = os.open(port_path, os.O_RDONLY)
+        try:
+            data = os.read(fd, 16)
+        finally:
+            os.close(fd)
+        port = int(data.strip())
+    except (OSError, ValueError):
+        return None
+    return port if 1 <= port <= 65535 else None
+
+
+_EXCLUDED_DIRS: frozenset[str] = frozenset({
+    "target", ".git", "node_modules", ".cpcache", ".clj-kondo",
+    ".lsp", ".shadow-cljs", "classes", "out",
+})
+
+
 def _glob_clojure_files(project_dir: Path) -> list[Path]:
-    excluded_dirs = {
-        "target", ".git", "node_modules", ".cpcache", ".clj-kondo",
-        ".lsp", ".shadow-cljs", "classes", "out",
-    }
+    # Iterative scandir walk: excluded dirs are pruned before descending, and
+    # DirEntry.is_dir() uses the d_type from the directory read instead of a stat.
     results: list[Path] = []
-    for ext in _CLJ_EXTENSIONS:
-        for path in project_dir.rglob(f"*{ext}"):
-            if any(excluded in path.parts for excluded in excluded_dirs):
-                continue
-            results.append(path)
+    stack = [str(project_dir)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in _EXCLUDED_DIRS:
+                            stack.append(entry.path)
+                    elif os.path.splitext(entry.name)[1] in _CLJ_EXTENSIONS:
+                        results.append(Path(entry.path))
+        except OSError as exc:
+            logger.warning("Skipping unreadable directory: %s", exc)
     return sorted(results)
 
 
+@functools.lru_cache(maxsize=1024)
+def _parse_ns_form_cached(source: str) -> tuple[str | None, tuple[str, ...]]:
+    # Pure on the source text, so re-parsing the same file is a cache hit.
+    # Requires are a tuple so cached results can't be mutated by callers.
+    ns_match = _NS_FORM_RE.search(source)
+    if ns_match is None:
+        return None, ()
+
+    ns_name = ns_match.group(1)
+    ns_region = _extract_ns_region(source)
+    requires = _parse_requires_fast(ns_region)
+    if requires is None:
+        requires = _parse_requires(ns_region)
+    return ns_name, tuple(requires)
+
+
 def _extract_ns_region(source: str) -> str:
     idx = source.find("(ns ")
     if idx == -1:
@@ -225,6 +277,102 @@ def _extract_ns_region(source: str) -> str:
     return source[idx:]
 
 
+_TOKEN_DELIMITERS: frozenset[str] = frozenset(" \t\r\n,()[]{}\"';")
+
+# Frame kinds for _parse_requires_fast. A "libs" frame takes bare symbols as
+# lib names (the :require clause itself, or a reader-conditional body).
+_FRAME_LIBS = 0
+_FRAME_LIBSPEC = 1
+_FRAME_PREFIX_LIST = 2
+_FRAME_IGNORED = 3
+
+
+def _parse_requires_fast(ns_region: str) -> list[str] | None:
+    """Single-pass scan of the (:require ...) clause — no regex backtracking.
+
+    Walks the clause once, tracking bracket nesting. Collects bare lib
+    symbols, the lib name that opens each [lib ...] libspec, and
+    prefix.suffix names from (prefix [suffix ...]) prefix lists; options
+    such as :as aliases and :refer vectors are skipped.
+
+    Returns None if the clause is not closed, so the caller can fall back
+    to the regex parser.
+    """
+    # Skip look-alikes such as (:require-macros ...): the keyword must end here
+    start = ns_region.find("(:require")
+    while start != -1:
+        after = start + len("(:require")
+        if after < len(ns_region) and ns_region[after] in " \t\r\n,)":
+            break
+        start = ns_region.find("(:require", after)
+    if start == -1:
+        return []
+
+    requires: set[str] = set()
+    # Each frame: [kind, prefix, seen_first_token]
+    stack: list[list] = [[_FRAME_LIBS, None, True]]
+    i = start + len("(:require")
+    n = len(ns_region)
+
+    while i < n:
+        c = ns_region[i]
+
+        if c in " \t\r\n,":
+            i += 1
+        elif c == ";":
+            newline = ns_region.find("\n", i)
+            i = n if newline == -1 else newline + 1
+        elif c == '"':
+            i += 1
+            while i < n and ns_region[i] != '"':
+                i += 2 if ns_region[i] == "\\" else 1
+            i += 1
+        elif c in "([{":
+            kind, prefix, seen_first = stack[-1]
+            if kind == _FRAME_LIBSPEC and not seen_first and c == "[":
+                # Vector of libspecs, e.g. #?@(:clj [[a.b :as b] [c.d]]) — libs, not a libspec.
+                stack[-1][0] = kind = _FRAME_LIBS
+            if kind in (_FRAME_LIBS, _FRAME_PREFIX_LIST) and c == "[":
+                stack.append([_FRAME_LIBSPEC, prefix, False])
+            elif kind == _FRAME_LIBS and c == "(":
+                stack.append([_FRAME_PREFIX_LIST, None, False])
+            else:
+                stack.append([_FRAME_IGNORED, None, True])
+            stack[-2][2] = True
+            i += 1
+        elif c in ")]}":
+            stack.pop()
+            if not stack:
+                return sorted(requires)
+            i += 1
+        else:
+            j = i
+            while j < n and ns_region[j] not in _TOKEN_DELIMITERS:
+                j += 1
+            token = ns_region[i:j] or ns_region[i]
+            i = max(j, i + 1)
+
+            frame = stack[-1]
+            kind, prefix, seen_first = frame
+            frame[2] = True
+            if token[0] in ":#'":
+                if kind == _FRAME_PREFIX_LIST and not seen_first:
+                    # Reader-conditional body, e.g. #?(:clj [a.b]) — libs, not a prefix.
+                    frame[0] = _FRAME_LIBS
+                continue
+            if kind == _FRAME_LIBS:
+                requires.add(token)
+            elif kind == _FRAME_LIBSPEC and not seen_first:
+                requires.add(f"{prefix}.{token}" if prefix else token)
+            elif kind == _FRAME_PREFIX_LIST:
+                if seen_first:
+                    requires.add(f"{frame[1]}.{token}")
+                else:
+                    frame[1] = token
+
+    return None
+
+
 def _parse_requires(ns_region: str) -> list[str]:
     require_match = _REQUIRE_BLOCK_RE.search(ns_region)
     if require_match is None:
@@ -233,14 +381,12 @@ def _parse_requires(ns_region: str) -> list[str]:
     require_body = require_match.group(1)
     requires: list[str] = []
 
-    bracket_re = re.compile(r"\[\s*([\w.*+!\-'?<>=/.]+)")
-    for match in bracket_re.finditer(require_body):
+    for match in _REQUIRE_BRACKET_RE.finditer(require_body):
         ns = match.group(1)
         if ns and not ns.startswith(":"):
             requires.append(ns)
 
-    bare_re = re.compile(r"(?<!\[)\b([\w]+(?:\.[\w.*+!\-'?<>=]+)+)\b")
-    for match in bare_re.finditer(require_body):
+    for match in _REQUIRE_BARE_RE.finditer(require_body):
         ns = match.group(1)
         if ns not in requires:
             requires.append(ns)
@@ -248,10 +394,10 @@ def _parse_requires(ns_region: str) -> list[str]:
     return sorted(set(requires))
 
 
-def _extract_functions(source: str) -> list[str]:
-    functions: list[str] = []
-    for match in _DEFN_RE.finditer(source):
-        functions.append(match.group(1))
-    for match in _DEFMETHOD_RE.finditer(source):
-        functions.append(f"{match.group(1)} {match.group(2).strip()}")
-    return functions
+def _extract_functions(source: str) -> tuple[str, ...]:
+    # Names like "->event" recur across files; interning shares one string.
+    functions = [match.group(1) for match in _DEFN_RE.finditer(source)]
+    functions.extend(
+        f"{match.group(1)} {match.group(2).strip()}" for match in _DEFMETHOD_RE.finditer(source)
+    )
+    return tuple(sys.intern(name) for name in functions)
@@ -12,7 +12,7 @@ from dataclasses import dataclass, field
 from knowledge.backends.base import NamespaceInfo, StructureResult
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class FlowGroup:
     """A connected subgraph of namespaces forming a data flow.
 
@@ -52,60 +52,60 @@ def partition_flow_groups(structure: StructureResult) -> list[FlowGroup]:
     ns_by_name: dict[str, NamespaceInfo] = {ns.name: ns for ns in structure.namespaces}
     all_names = sorted(ns_by_name.keys())
 
-    # Union-Find for connected components
-    parent: dict[str, str] = {n: n for n in all_names}
+    # Union-Find over namespace indices (path halving + union by rank)
+    index: dict[str, int] = {name: i for i, name in enumerate(all_names)}
+    parent: list[int] = list(range(len(all_names)))
+    rank: list[int] = [0] * len(all_names)
 
-    def find(x: str) -> str:
+    def find(x: int) -> int:
         while parent[x] != x:
             parent[x] = parent[parent[x]]
             x = parent[x]
         return x
 
-    def union(a: str, b: str) -> None:
+    def union(a: int, b: int) -> None:
         ra, rb = find(a), find(b)
-        if ra != rb:
-            # Deterministic: smaller name becomes root
-            if ra > rb:
-                ra, rb = rb, ra
-            parent[rb] = ra
-
-    # Build undirected edges from dependency map
-    for ns_name in all_names:
-        for dep in structure.dependency_map.get(ns_name, []):
-            if dep in ns_by_name:
-                union(ns_name, dep)
-
-    # Group by component root
-    components: dict[str, list[str]] = {}
-    for name in all_names:
-        root = find(name)
-        components.setdefault(root, []).append(name)
-
-    # Build FlowGroups
+        if ra == rb:
+            return
+        if rank[ra] < rank[rb]:
+            ra, rb = rb, ra
+        parent[rb] = ra
+        if rank[ra] == rank[rb]:
+            rank[ra] += 1
+
+    # One pass over the edges: build the undirected union-find edges and
+    # record each namespace's resolved deps. Every resolved edge joins its two
+    # ends, so it is internal to exactly one group.
+    resolved_deps: dict[str, list[str]] = {}
+    required: set[str] = set()
+    for i, ns_name in enumerate(all_names):
+        deps = [d for d in structure.dependency_map.get(ns_name, []) if d in index]
+        if deps:
+            resolved_deps[ns_name] = sorted(deps)
+            required.update(deps)
+            for dep in deps:
+                union(i, index[dep])
+
+    # Group by component root; members stay in name order since all_names is sorted
+    components: dict[int, list[str]] = {}
+    for i, name in enumerate(all_names):
+        components.setdefault(find(i), []).append(name)
+
+    # Build FlowGroups, ordered by each group's first namespace name
     groups: list[FlowGroup] = []
-    for root in sorted(components.keys()):
-        members = components[root]
-        member_set = set(members)
-
+    for members in sorted(components.values(), key=lambda m: m[0]):
         # Internal deps: only edges within this group
-        internal_deps: dict[str, list[str]] = {}
-        for name in members:
-            deps_in_group = [
-                d for d in structure.dependency_map.get(name, []) if d in member_set
-            ]
-            if deps_in_group:
-                internal_deps[name] = sorted(deps_in_group)
+        internal_deps: dict[str, list[str]] = {
+            n: resolved_deps[n] for n in members if n in resolved_deps
+        }
 
         # Entry points: don't require any other member (data flow starts here)
         # In Clojure :require, "A requires B" means data flows FROM B TO A.
         # So entry points are namespaces that don't depend on anything in the group.
-        entry_points = sorted(n for n in members if n not in internal_deps)
+        entry_points = [n for n in members if n not in internal_deps]
 
         # Exit points: not required by any other member (data flow ends here)
-        required_by_others = set()
-        for deps in internal_deps.values():
-            required_by_others.update(deps)
-        exit_points = sorted(n for n in members if n not in required_by_others)
+        exit_points = [n for n in members if n not in required]
 
         # Deterministic group name from first member
         group_name = f"flow-{members[0].split('.')[-1]}" if members else "flow-unknown"
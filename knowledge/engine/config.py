@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import functools
 import os
 from dataclasses import dataclass
 from decimal import Decimal
 from pathlib import Path
+from types import MappingProxyType
+from typing import Any
 
 import yaml
 
@@ -15,6 +18,13 @@ MODEL_REGISTRY: dict[str, str] = {
     "latest-haiku": "anthropic/claude-haiku-4-5-20251001",
 }
 
+# Aliases plus identity entries for their concrete IDs, so the common inputs
+# resolve with a single lookup.
+_RESOLVED = MappingProxyType({
+    **{model_id: model_id for model_id in MODEL_REGISTRY.values()},
+    **MODEL_REGISTRY,
+})
+
 _DEFAULT_CONFIG_PATH = Path(__file__).parent / "config.yaml"
 
 
@@ -30,9 +40,10 @@ def resolve_model(alias: str) -> str:
     Raises:
         ValueError: If alias is not found in registry and doesn't look like a concrete ID.
     """
-    if alias in MODEL_REGISTRY:
-        return MODEL_REGISTRY[alias]
-    if alias.startswith("claude-") or alias.startswith("anthropic/"):
+    resolved = _RESOLVED.get(alias)
+    if resolved is not None:
+        return resolved
+    if alias.startswith(("claude-", "anthropic/")):
         return alias
     raise ValueError(
         f"Unknown model alias: {alias!r}. "
@@ -63,6 +74,17 @@ class EngineConfig:
     guardrails: GuardrailsConfig
 
 
+@functools.lru_cache(maxsize=8)
+def _parse_yaml_cached(path_str: str, mtime_ns: int) -> Any:
+    """Parse a config YAML file, cached per (path, modification time).
+
+    mtime_ns is only part of the cache key: editing the file invalidates the
+    entry. The result is shared between callers and must not be mutated.
+    """
+    with open(path_str, encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
 def load_config(config_path: Path | None = None) -> EngineConfig:
     """Load engine configuration from YAML, with env var overrides.
 
@@ -77,11 +99,12 @@ def load_config(config_path: Path | None = None) -> EngineConfig:
     """
     path = config_path or _DEFAULT_CONFIG_PATH
 
-    if path.exists():
-        with open(path, encoding="utf-8") as f:
-            raw = yaml.safe_load(f)
-    else:
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
         raw = {}
+    else:
+        raw = _parse_yaml_cached(str(path), mtime_ns)
 
     engine = raw.get("engine", {})
     root_lm = engine.get("root_lm", {})
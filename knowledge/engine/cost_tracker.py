@@ -2,6 +2,11 @@
 
 from __future__ import annotations
 
+import math
+import sys
+import threading
+from collections import defaultdict
+from collections.abc import Iterable
 from dataclasses import dataclass, field
 from decimal import Decimal
 from enum import Enum
@@ -15,17 +20,25 @@ class GuardrailStatus(Enum):
     EXCEEDED = "exceeded"
 
 
-# Pricing per million tokens (approximate, for estimation only).
-MODEL_PRICING: dict[str, dict[str, Decimal]] = {
-    "anthropic/claude-opus-4-6": {"input": Decimal("15.00"), "output": Decimal("75.00")},
-    "anthropic/claude-sonnet-4-6": {"input": Decimal("3.00"), "output": Decimal("15.00")},
-    "anthropic/claude-haiku-4-5-20251001": {"input": Decimal("1.00"), "output": Decimal("5.00")},
+# Pricing in integer micro-USD per million tokens, so fractional list prices
+# such as $0.80/M (800_000) stay exact. Approximate, for estimation only.
+# tokens * price accumulates as an integer count of pico-USD (micro-USD per
+# million tokens, times tokens); Decimal is only produced at the reporting boundary.
+MODEL_PRICING: dict[str, dict[str, int]] = {
+    "anthropic/claude-opus-4-6": {"input": 15_000_000, "output": 75_000_000},
+    "anthropic/claude-sonnet-4-6": {"input": 3_000_000, "output": 15_000_000},
+    "anthropic/claude-haiku-4-5-20251001": {"input": 1_000_000, "output": 5_000_000},
 }
 
 # Safe default for unknown models — use Opus pricing (most expensive = conservative).
-_DEFAULT_PRICING: dict[str, Decimal] = {"input": Decimal("15.00"), "output": Decimal("75.00")}
+_DEFAULT_PRICING: dict[str, int] = {"input": 15_000_000, "output": 75_000_000}
 
-_ONE_MILLION = Decimal("1000000")
+_PICOS_PER_USD = 10**12
+
+
+def _usd_to_picos(amount: Decimal) -> int:
+    """Convert a USD threshold to pico-USD, rounding up so `>=` checks stay exact."""
+    return math.ceil(amount * _PICOS_PER_USD)
 
 
 @dataclass(frozen=True)
@@ -46,26 +59,68 @@ class CostTracker:
         self._config = config
         self._total_input_tokens: int = 0
         self._total_output_tokens: int = 0
-        self._total_cost: Decimal = Decimal("0")
-        self._calls_by_model: dict[str, int] = {}
+        self._cost_picos: int = 0
+        self._max_cost_picos: int = _usd_to_picos(config.max_cost_per_run_usd)
+        self._warn_cost_picos: int = _usd_to_picos(config.warn_cost_threshold_usd)
+        self._calls_by_model: defaultdict[str, int] = defaultdict(int)
         self._sub_lm_calls: int = 0
+        self._status: GuardrailStatus = GuardrailStatus.OK
+        # PipelineRunner records from worker threads; totals and the cached
+        # status must move together or a stale WARNING could overwrite EXCEEDED.
+        self._lock = threading.Lock()
+        self._update_status()
 
     def record(self, model: str, input_tokens: int, output_tokens: int) -> None:
         """Record a completed API call and update running totals."""
+        # The same few model IDs repeat on every call; interning lets dict
+        # lookups match on identity instead of comparing the full string.
+        model = sys.intern(model)
         pricing = MODEL_PRICING.get(model, _DEFAULT_PRICING)
-        input_cost = pricing["input"] * Decimal(input_tokens) / _ONE_MILLION
-        output_cost = pricing["output"] * Decimal(output_tokens) / _ONE_MILLION
 
-        self._total_input_tokens += input_tokens
-        self._total_output_tokens += output_tokens
-        self._total_cost += input_cost + output_cost
-        self._calls_by_model[model] = self._calls_by_model.get(model, 0) + 1
-        self._sub_lm_calls += 1
+        with self._lock:
+            self._total_input_tokens += input_tokens
+            self._total_output_tokens += output_tokens
+            self._cost_picos += input_tokens * pricing["input"] + output_tokens * pricing["output"]
+            self._calls_by_model[model] += 1
+            self._sub_lm_calls += 1
+            self._update_status()
+
+    def record_many(self, events: Iterable[tuple[str, int, int]]) -> None:
+        """Record a batch of completed API calls.
+
+        Equivalent to calling record() once per event, but token counts are
+        summed per model first so pricing is applied once per distinct model.
+
+        Args:
+            events: (model, input_tokens, output_tokens) tuples.
+        """
+        totals: dict[str, list[int]] = {}
+        for model, input_tokens, output_tokens in events:
+            entry = totals.get(model)
+            if entry is None:
+                totals[model] = [input_tokens, output_tokens, 1]
+            else:
+                entry[0] += input_tokens
+                entry[1] += output_tokens
+                entry[2] += 1
+
+        with self._lock:
+            for model, (input_tokens, output_tokens, calls) in totals.items():
+                model = sys.intern(model)
+                pricing = MODEL_PRICING.get(model, _DEFAULT_PRICING)
+                self._total_input_tokens += input_tokens
+                self._total_output_tokens += output_tokens
+                self._cost_picos += (
+                    input_tokens * pricing["input"] + output_tokens * pricing["output"]
+                )
+                self._calls_by_model[model] += calls
+                self._sub_lm_calls += calls
+            self._update_status()
 
     @property
     def estimated_cost_usd(self) -> Decimal:
         """Current estimated total cost."""
-        return self._total_cost
+        return Decimal(self._cost_picos) / _PICOS_PER_USD
 
     @property
     def sub_lm_call_count(self) -> int:
@@ -77,24 +132,30 @@ class CostTracker:
 
         Returns OK, WARNING, or EXCEEDED. If guardrails disabled, always OK.
         """
-        if not self._config.enabled:
-            return GuardrailStatus.OK
+        return self._status
 
-        if self._total_cost >= self._config.max_cost_per_run_usd:
-            return GuardrailStatus.EXCEEDED
+    def _update_status(self) -> None:
+        """Escalate the cached guardrail status after totals change.
 
-        if self._sub_lm_calls >= self._config.max_sub_lm_calls:
-            return GuardrailStatus.EXCEEDED
-
-        if self._total_cost >= self._config.warn_cost_threshold_usd:
-            return GuardrailStatus.WARNING
+        Cost and call counts only grow, so the status can only move from OK to
+        WARNING to EXCEEDED; once EXCEEDED there is nothing left to check.
+        Callers hold self._lock (except __init__, before any sharing).
+        """
+        if not self._config.enabled or self._status is GuardrailStatus.EXCEEDED:
+            return
 
-        return GuardrailStatus.OK
+        if (
+            self._cost_picos >= self._max_cost_picos
+            or self._sub_lm_calls >= self._config.max_sub_lm_calls
+        ):
+            self._status = GuardrailStatus.EXCEEDED
+        elif self._cost_picos >= self._warn_cost_picos:
+            self._status = GuardrailStatus.WARNING
 
     def summary(self) -> CostSummary:
         """Return a summary of all costs accumulated so far."""
         return CostSummary(
-            total_cost_usd=self._total_cost,
+            total_cost_usd=self.estimated_cost_usd,
             total_input_tokens=self._total_input_tokens,
             total_output_tokens=self._total_output_tokens,
             calls_by_model=dict(self._calls_by_model),
@@ -110,6 +110,19 @@ def _split_oversized_groups(
     return result
 
 
+def _pin_group_identity(analysis: dict, group: FlowGroup) -> dict:
+    """Overwrite the group identity fields echoed by the sub-LM with the real ones.
+
+    Downstream bead creation keys analyses by flow_name and links them by
+    group name, so a model that copies the schema placeholder must not leak
+    through.
+    """
+    analysis["flow_name"] = group.name
+    analysis["entry_points"] = list(group.entry_points)
+    analysis["exit_points"] = list(group.exit_points)
+    return analysis
+
+
 class PipelineRunner:
     """Deterministic pipeline: dispatch sub-LMs per flow group, validate, collect."""
 
@@ -171,10 +184,14 @@ class PipelineRunner:
 
         analyses: list[dict] = []
         validation_errors: list[tuple[str, str]] = []
+        # Rendered prompts by group name, reused by the validation retry.
+        # Local to this run so the (large) prompts are freed when it returns.
+        prompts: dict[str, str] = {}
 
         # Fan-out: parallel sub-LM calls
         def _analyze_group(group: FlowGroup) -> tuple[str, str]:
             prompt = build_flow_group_prompt(group, source_by_namespace, mode)
+            prompts[group.name] = prompt
             raw = self._call_sub_lm_for_group(prompt)
             return group.name, raw
 
@@ -207,16 +224,20 @@ class PipelineRunner:
             if not raw:
                 continue  # already recorded as API error
             try:
-                validated = validate_flow_analysis(raw)
+                validated = _pin_group_identity(validate_flow_analysis(raw), group)
                 analyses.append(validated)
                 logger.info("Validated: %s (%d namespaces)", group.name, len(validated.get("namespaces", [])))
             except ValidationError as exc:
                 logger.warning("Validation failed for %s: %s — retrying", group.name, exc)
                 try:
-                    retry_prompt = build_flow_group_prompt(group, source_by_namespace, mode)
+                    retry_prompt = prompts.get(group.name) or build_flow_group_prompt(
+                        group, source_by_namespace, mode
+                    )
                     retry_prompt += f"\n\nPrevious attempt failed validation: {exc}\nFix the JSON and try again."
                     retry_raw = self._call_sub_lm_for_group(retry_prompt)
-                    validated = validate_flow_analysis(retry_raw)
+                    validated = _pin_group_identity(
+                        validate_flow_analysis(retry_raw), group
+                    )
                     analyses.append(validated)
                     logger.info("Retry succeeded: %s", group.name)
                 except (ValidationError, Exception) as retry_exc:
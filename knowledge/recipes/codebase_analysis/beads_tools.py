@@ -35,10 +35,14 @@ def _validate_bead_id(bead_id: str) -> None:
 
 
 def _validate_rel_type(rel_type: str) -> None:
-    if rel_type not in _VALID_REL_TYPES:
-        raise ValueError(
-            f"Invalid rel_type: {rel_type!r}. Must be one of: {sorted(_VALID_REL_TYPES)}"
-        )
+    # Only three values — a literal match avoids hashing rel_type on every link.
+    match rel_type:
+        case "depends-on" | "relates-to" | "blocks":
+            return
+        case _:
+            raise ValueError(
+                f"Invalid rel_type: {rel_type!r}. Must be one of: {sorted(_VALID_REL_TYPES)}"
+            )
 
 
 def _validate_tag(tag: str) -> None:
@@ -46,24 +50,51 @@ def _validate_tag(tag: str) -> None:
         raise ValueError(f"Invalid tag format: {tag!r}")
 
 
-def _run_bd(args: list[str], db_path: Path | None = None) -> subprocess.CompletedProcess[str]:
-    """Run a bd CLI command safely.
+def _bd_cmd(args: list[str], db_path: Path | None) -> list[str]:
+    """Build a bd argv, injecting --db <path> before the subcommand args.
 
-    When db_path is provided, injects --db <path> before the subcommand args
-    so that bd operates on a specific database file without needing cwd.
+    When db_path is provided, bd operates on a specific database file
+    without needing cwd.
     """
     cmd = ["bd"]
     if db_path:
         cmd.extend(["--db", str(db_path), "--no-daemon"])
     cmd.extend(args)
+    return cmd
+
+
+def _run_bd(args: list[str], db_path: Path | None = None) -> subprocess.CompletedProcess[str]:
+    """Run a bd CLI command safely, capturing decoded stdout and stderr."""
     return subprocess.run(
-        cmd,
+        _bd_cmd(args, db_path),
         capture_output=True,
         text=True,
         timeout=30,
     )
 
 
+def _run_bd_fast(args: list[str], db_path: Path | None = None) -> bool:
+    """Run a bd CLI command whose output is not needed. Returns True on success.
+
+    stdout is discarded and stderr is kept as raw bytes, decoded only
+    for the log message when the command fails.
+    """
+    result = subprocess.run(
+        _bd_cmd(args, db_path),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        timeout=30,
+    )
+    if result.returncode != 0:
+        _logger.warning(
+            "bd %s failed: %s",
+            args[0],
+            result.stderr.decode("utf-8", errors="replace").strip(),
+        )
+        return False
+    return True
+
+
 def create_bead(
     title: str, body: str, tags: list[str] | None = None, db_path: Path | None = None
 ) -> str:
@@ -94,11 +125,9 @@ def link_beads(from_id: str, to_id: str, rel_type: str, db_path: Path | None = N
 
     if rel_type == "blocks":
         # "from blocks to" means "to depends on from"
-        result = _run_bd(["dep", "add", to_id, from_id], db_path)
-    else:
-        # "from depends on to" or "from relates to to"
-        result = _run_bd(["dep", "add", from_id, to_id], db_path)
-    return result.returncode == 0
+        return _run_bd_fast(["dep", "add", to_id, from_id], db_path)
+    # "from depends on to" or "from relates to to"
+    return _run_bd_fast(["dep", "add", from_id, to_id], db_path)
 
 
 def tag_bead(bead_id: str, tags: list[str], db_path: Path | None = None) -> bool:
@@ -109,8 +138,7 @@ def tag_bead(bead_id: str, tags: list[str], db_path: Path | None = None) -> bool
 
     success = True
     for tag in tags:
-        result = _run_bd(["label", "add", bead_id, tag], db_path)
-        if result.returncode != 0:
+        if not _run_bd_fast(["label", "add", bead_id, tag], db_path):
             success = False
     return success
 
@@ -118,15 +146,13 @@ def tag_bead(bead_id: str, tags: list[str], db_path: Path | None = None) -> bool
 def comment_bead(bead_id: str, text: str, db_path: Path | None = None) -> bool:
     """Add a comment to a bead. Returns True on success."""
     _validate_bead_id(bead_id)
-    result = _run_bd(["comments", "add", bead_id, text], db_path)
-    return result.returncode == 0
+    return _run_bd_fast(["comments", "add", bead_id, text], db_path)
 
 
 def close_bead(bead_id: str, summary: str, db_path: Path | None = None) -> bool:
     """Close a bead with a reason. Returns True on success."""
     _validate_bead_id(bead_id)
-    result = _run_bd(["close", bead_id, "-r", summary], db_path)
-    return result.returncode == 0
+    return _run_bd_fast(["close", bead_id, "-r", summary], db_path)
 
 
 def query_beads(filter_expr: str, db_path: Path | None = None) -> str:
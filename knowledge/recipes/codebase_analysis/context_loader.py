@@ -110,10 +110,11 @@ def load_source_for_namespace(namespace_path: str) -> str:
     Raises:
         FileNotFoundError: If the file doesn't exist.
     """
-    path = Path(namespace_path)
-    if not path.exists():
-        raise FileNotFoundError(f"Source file not found: {namespace_path}")
-    return path.read_text(encoding="utf-8")
+    # One open() instead of exists() + read_text(); bytes avoid newline translation.
+    try:
+        return Path(namespace_path).read_bytes().decode("utf-8")
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Source file not found: {namespace_path}") from None
 
 
 def _build_structure_summary(structure: StructureResult, project_dir: Path) -> dict:
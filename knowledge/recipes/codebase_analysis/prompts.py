@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import json
 
+from knowledge.backends.base import NamespaceInfo
 from knowledge.engine.chunking import FlowGroup
 
 CODEBASE_ANALYSIS_PROMPT = """\
@@ -169,8 +170,6 @@ def build_analysis_prompt(
     Returns:
         Complete system prompt string.
     """
-    import json
-
     structure_json = json.dumps(structure_summary, indent=2, default=str)
 
     prompt = CODEBASE_ANALYSIS_PROMPT.format(
@@ -200,24 +199,11 @@ def get_layer_prompt(layer: str) -> str:
 # Schema-driven flow-group prompts (deterministic pipeline)
 # ---------------------------------------------------------------------------
 
-_FLOW_GROUP_PROMPT = """\
-Analyze this flow group from the {project_mode} of a Clojure service following Diplomat Architecture.
-
-## Flow Group: {flow_name}
-Entry points: {entry_points}
-Exit points: {exit_points}
-
-## Namespaces in this flow ({ns_count} total):
-{namespace_listing}
-
-## Internal Dependencies:
-{dependency_listing}
-
-## Source Code:
-{source_blocks}
+_FLOW_GROUP_INSTRUCTIONS = """\
+Analyze a flow group from the {project_mode} of a Clojure service following Diplomat Architecture.
 
 ## Instructions
-Analyze these namespaces. You can see ALL the source code for this flow group.
+The flow group is described at the end of this prompt, with ALL of its source code.
 
 For each namespace, identify:
 - Its role in the flow (1-2 sentences)
@@ -237,7 +223,24 @@ Respond with ONLY a JSON object (no markdown, no explanation) conforming to this
 
 {schema_example}
 
-Every namespace in this flow group MUST appear in the "namespaces" array.
+Copy flow_name, entry_points and exit_points exactly as given for the flow group.
+Every namespace in the flow group MUST appear in the "namespaces" array.
+"""
+
+_FLOW_GROUP_SECTION = """\
+
+## Flow Group: {flow_name}
+Entry points: {entry_points}
+Exit points: {exit_points}
+
+## Namespaces in this flow ({ns_count} total):
+{namespace_listing}
+
+## Internal Dependencies:
+{dependency_listing}
+
+## Source Code:
+{source_blocks}
 """
 
 _SECURITY_ADDENDUM = """\
@@ -245,6 +248,34 @@ _SECURITY_ADDENDUM = """\
   auth bypass paths, PII exposure, injection vectors, trust boundary violations
 """
 
+_SCHEMA_EXAMPLE = json.dumps({
+    "flow_name": "flow-name",
+    "entry_points": ["namespace.name"],
+    "exit_points": ["namespace.name"],
+    "namespaces": [
+        {
+            "name": "namespace.name",
+            "layer": "logic|model|controller|adapter|wire-in|wire-out|diplomat-datomic|diplomat-http|diplomat-kafka|unknown",
+            "role": "1-2 sentence description of this namespace's purpose in the flow",
+            "side_effects": ["datomic", "kafka", "http", "s3"],
+            "security_notes": "string or null",
+        }
+    ],
+    "bottlenecks": ["description of bottleneck"],
+    "security_findings": ["description of finding"],
+    "coupling_issues": ["description of coupling issue"],
+}, indent=2)
+
+
+def _source_for(ns: NamespaceInfo, source_by_namespace: dict[str, str]) -> str:
+    return source_by_namespace.get(ns.name, source_by_namespace.get(ns.path, ""))
+
+
+def _source_block(name: str, src: str) -> str:
+    if src:
+        return f"### {name}\n```clojure\n{src}\n```"
+    return f"### {name}\n(source not available)"
+
 
 def build_flow_group_prompt(
     group: FlowGroup,
@@ -256,6 +287,10 @@ def build_flow_group_prompt(
     Includes full source code for all namespaces in the group,
     dependency edges, and the JSON schema template.
 
+    The prompt is ordered static-first: instructions and schema are identical
+    for every group in a run, so provider-side prompt caches can reuse that
+    prefix. Group-specific content comes last.
+
     Args:
         group: The flow group to analyze.
         source_by_namespace: Map of namespace name -> source code.
@@ -264,9 +299,10 @@ def build_flow_group_prompt(
     Returns:
         Complete prompt string for the sub-LM.
     """
+    sorted_namespaces = sorted(group.namespaces, key=lambda n: n.name)
+
     namespace_listing = "\n".join(
-        f"  - {ns.name} (layer: {ns.layer or 'unknown'})"
-        for ns in sorted(group.namespaces, key=lambda n: n.name)
+        f"  - {ns.name} (layer: {ns.layer or 'unknown'})" for ns in sorted_namespaces
     )
 
     dep_lines = []
@@ -275,41 +311,22 @@ def build_flow_group_prompt(
             dep_lines.append(f"  {from_ns} depends on {to_ns}")
     dependency_listing = "\n".join(dep_lines) if dep_lines else "  (no internal dependencies)"
 
-    source_blocks = []
-    for ns in sorted(group.namespaces, key=lambda n: n.name):
-        src = source_by_namespace.get(ns.name, source_by_namespace.get(ns.path, ""))
-        if src:
-            source_blocks.append(f"### {ns.name}\n```clojure\n{src}\n```")
-        else:
-            source_blocks.append(f"### {ns.name}\n(source not available)")
-
-    schema_example = json.dumps({
-        "flow_name": group.name,
-        "entry_points": group.entry_points,
-        "exit_points": group.exit_points,
-        "namespaces": [
-            {
-                "name": "namespace.name",
-                "layer": "logic|model|controller|adapter|wire-in|wire-out|diplomat-datomic|diplomat-http|diplomat-kafka|unknown",
-                "role": "1-2 sentence description of this namespace's purpose in the flow",
-                "side_effects": ["datomic", "kafka", "http", "s3"],
-                "security_notes": "string or null",
-            }
-        ],
-        "bottlenecks": ["description of bottleneck"],
-        "security_findings": ["description of finding"],
-        "coupling_issues": ["description of coupling issue"],
-    }, indent=2)
-
-    return _FLOW_GROUP_PROMPT.format(
+    source_blocks = [
+        _source_block(ns.name, _source_for(ns, source_by_namespace)) for ns in sorted_namespaces
+    ]
+
+    prompt = _FLOW_GROUP_INSTRUCTIONS.format(
         project_mode="security posture" if mode == "security" else "structure",
+        security_instructions=_SECURITY_ADDENDUM if mode == "security" else "",
+        schema_example=_SCHEMA_EXAMPLE,
+    )
+
+    return prompt + _FLOW_GROUP_SECTION.format(
         flow_name=group.name,
         entry_points=", ".join(group.entry_points) or "(none identified)",
         exit_points=", ".join(group.exit_points) or "(none identified)",
-        ns_count=len(group.namespaces),
+        ns_count=len(sorted_namespaces),
         namespace_listing=namespace_listing,
         dependency_listing=dependency_listing,
         source_blocks="\n\n".join(source_blocks),
-        security_instructions=_SECURITY_ADDENDUM if mode == "security" else "",
-        schema_example=schema_example,
     )
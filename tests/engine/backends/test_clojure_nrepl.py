@@ -16,9 +16,50 @@ from knowledge.backends.clojure_nrepl import (
     _extract_ns_region,
     _glob_clojure_files,
     _parse_requires,
+    _parse_requires_fast,
 )
 
 
+_SAMPLE_CLJ = textwrap.dedent("""\
+    (ns nu.customer.logic.payment
+      (:require
+        [nu.customer.model.payment :as model]
+        [nu.customer.wire.payment :as wire]
+        [nu.libs.kafka.producer :as kafka]
+        [nu.libs.datomic.api :as datomic]
+        [clojure.string :as str]))
+
+    (defn validate-amount [amount]
+      (when (<= amount 0)
+        (throw (ex-info "Amount must be positive" {:amount amount}))))
+
+    (defn process-payment [request]
+      (let [amount (:amount request)]
+        (validate-amount amount)
+        (datomic/transact (model/->transaction request))
+        (kafka/publish :payment-events (wire/->event request))))
+
+    (defn- internal-helper [x] (* x 2))
+""")
+
+_ADAPTER_CLJ = textwrap.dedent("""\
+    (ns nu.customer.adapter.payment-http
+      (:require [nu.customer.controller.payment :as controller]))
+    (defn handle-request [req] (controller/process req))
+""")
+
+_MODEL_CLJ = textwrap.dedent("""\
+    (ns nu.customer.model.payment)
+    (defn ->transaction [request] {:tx-data []})
+""")
+
+_WIRE_CLJ = textwrap.dedent("""\
+    (ns nu.customer.wire.payment
+      (:require [cheshire.core :as json]))
+    (defn ->event [request] (json/generate-string request))
+""")
+
+
 @pytest.fixture
 def backend() -> ClojureNREPLBackend:
     return ClojureNREPLBackend(nrepl_port=None)
@@ -26,31 +67,13 @@ def backend() -> ClojureNREPLBackend:
 
 @pytest.fixture
 def sample_clj_source() -> str:
-    return textwrap.dedent("""\
-        (ns nu.customer.logic.payment
-          (:require
-            [nu.customer.model.payment :as model]
-            [nu.customer.wire.payment :as wire]
-            [nu.libs.kafka.producer :as kafka]
-            [nu.libs.datomic.api :as datomic]
-            [clojure.string :as str]))
+    return _SAMPLE_CLJ
 
-        (defn validate-amount [amount]
-          (when (<= amount 0)
-            (throw (ex-info "Amount must be positive" {:amount amount}))))
 
-        (defn process-payment [request]
-          (let [amount (:amount request)]
-            (validate-amount amount)
-            (datomic/transact (model/->transaction request))
-            (kafka/publish :payment-events (wire/->event request))))
-
-        (defn- internal-helper [x] (* x 2))
-    """)
-
-
-@pytest.fixture
-def mock_project(tmp_path: Path, sample_clj_source: str) -> Path:
+@pytest.fixture(scope="session")
+def mock_project(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    # Built once per session: no test in this module writes to the project.
+    tmp_path = tmp_path_factory.mktemp("clj_proj")
     logic_dir = tmp_path / "src" / "nu" / "customer" / "logic"
     logic_dir.mkdir(parents=True)
     adapter_dir = tmp_path / "src" / "nu" / "customer" / "adapter"
@@ -60,21 +83,10 @@ def mock_project(tmp_path: Path, sample_clj_source: str) -> Path:
     wire_dir = tmp_path / "src" / "nu" / "customer" / "wire"
     wire_dir.mkdir(parents=True)
 
-    (logic_dir / "payment.clj").write_text(sample_clj_source, encoding="utf-8")
-    (adapter_dir / "payment_http.clj").write_text(textwrap.dedent("""\
-        (ns nu.customer.adapter.payment-http
-          (:require [nu.customer.controller.payment :as controller]))
-        (defn handle-request [req] (controller/process req))
-    """), encoding="utf-8")
-    (model_dir / "payment.clj").write_text(textwrap.dedent("""\
-        (ns nu.customer.model.payment)
-        (defn ->transaction [request] {:tx-data []})
-    """), encoding="utf-8")
-    (wire_dir / "payment.clj").write_text(textwrap.dedent("""\
-        (ns nu.customer.wire.payment
-          (:require [cheshire.core :as json]))
-        (defn ->event [request] (json/generate-string request))
-    """), encoding="utf-8")
+    (logic_dir / "payment.clj").write_text(_SAMPLE_CLJ, encoding="utf-8")
+    (adapter_dir / "payment_http.clj").write_text(_ADAPTER_CLJ, encoding="utf-8")
+    (model_dir / "payment.clj").write_text(_MODEL_CLJ, encoding="utf-8")
+    (wire_dir / "payment.clj").write_text(_WIRE_CLJ, encoding="utf-8")
 
     # target dir should be excluded
     target_dir = tmp_path / "target" / "classes"
@@ -117,6 +129,52 @@ class TestParseNsForm:
         assert ns_name is None
         assert requires == []
 
+    def test_repeat_parse_returns_independent_lists(
+        self, backend: ClojureNREPLBackend, sample_clj_source: str
+    ) -> None:
+        _, first = backend._parse_ns_form(sample_clj_source)
+        first.append("mutated.by.caller")
+        _, second = backend._parse_ns_form(sample_clj_source)
+        assert "mutated.by.caller" not in second
+
+
+class TestParseRequiresFast:
+
+    def test_libspecs_and_bare_symbols(self) -> None:
+        region = "(ns a (:require [nu.b :as b] clojure.set [nu.c]))"
+        assert _parse_requires_fast(region) == ["clojure.set", "nu.b", "nu.c"]
+
+    def test_skips_refer_vectors_and_comments(self) -> None:
+        region = "(ns a (:require [clojure.string :refer [join]] ; [commented.out]\n))"
+        assert _parse_requires_fast(region) == ["clojure.string"]
+
+    def test_prefix_list(self) -> None:
+        region = "(ns a (:require (nu.svc [model :as m] wire)))"
+        assert _parse_requires_fast(region) == ["nu.svc.model", "nu.svc.wire"]
+
+    def test_reader_conditional(self) -> None:
+        region = "(ns a (:require #?(:clj [java.io :as io] :cljs [goog.str])))"
+        assert _parse_requires_fast(region) == ["goog.str", "java.io"]
+
+    def test_splicing_reader_conditional(self) -> None:
+        region = (
+            "(ns app.core (:require #?@(:clj [[clojure.java.io :as io] [app.db :as db]]"
+            " :cljs [[app.js]]) [app.util :as u]))"
+        )
+        assert _parse_requires_fast(region) == [
+            "app.db", "app.js", "app.util", "clojure.java.io",
+        ]
+
+    def test_require_macros_clause_is_skipped(self) -> None:
+        region = "(ns a.b (:require-macros [m.acro :as m]) (:require [real.ns :as r]))"
+        assert _parse_requires_fast(region) == ["real.ns"]
+
+    def test_no_require_clause(self) -> None:
+        assert _parse_requires_fast("(ns a)") == []
+
+    def test_unclosed_clause_returns_none(self) -> None:
+        assert _parse_requires_fast("(ns a (:require [nu.b") is None
+
 
 class TestClassifyDiplomatLayer:
 
@@ -169,6 +227,12 @@ class TestExtractFunctions:
         functions = _extract_functions(source)
         assert "area :circle" in functions
 
+    def test_names_shared_across_sources(self) -> None:
+        first = _extract_functions("(defn ->event [x] x)")
+        second = _extract_functions("(ns other)\n(defn ->event [y] y)")
+        assert first == ("->event",)
+        assert first[0] is second[0]
+
 
 class TestGlobClojureFiles:
 
@@ -182,6 +246,18 @@ class TestGlobClojureFiles:
         for f in files:
             assert "target" not in f.parts
 
+    def test_finds_cljc_and_skips_other_extensions(self, tmp_path: Path) -> None:
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "a.cljc").write_text("(ns a)", encoding="utf-8")
+        (tmp_path / "src" / "b.cljs").write_text("(ns b)", encoding="utf-8")
+        assert [f.name for f in _glob_clojure_files(tmp_path)] == ["a.cljc"]
+
+    def test_excluded_name_above_project_root_is_ignored(self, tmp_path: Path) -> None:
+        project = tmp_path / "out" / "proj"
+        project.mkdir(parents=True)
+        (project / "core.clj").write_text("(ns core)", encoding="utf-8")
+        assert [f.name for f in _glob_clojure_files(project)] == ["core.clj"]
+
 
 class TestDetectNreplPort:
 
@@ -196,6 +272,16 @@ class TestDetectNreplPort:
         (tmp_path / ".nrepl-port").write_text("not-a-number", encoding="utf-8")
         assert _detect_nrepl_port(tmp_path) is None
 
+    def test_rejects_out_of_range(self, tmp_path: Path) -> None:
+        (tmp_path / ".nrepl-port").write_text("70000\n", encoding="utf-8")
+        assert _detect_nrepl_port(tmp_path) is None
+
+    def test_finds_port_in_parent(self, tmp_path: Path) -> None:
+        (tmp_path / ".nrepl-port").write_text("7888\n", encoding="utf-8")
+        nested = tmp_path / "src" / "app"
+        nested.mkdir(parents=True)
+        assert _detect_nrepl_port(nested) == 7888
+
 
 class TestExtractStructure:
 
@@ -121,6 +121,21 @@ class TestPartitionFlowGroups:
         assert "svc.wire.in.pay" in g.entry_points
         assert "svc.logic.pay" in g.exit_points
 
+    def test_internal_deps_exclude_external_namespaces(self) -> None:
+        """Deps on namespaces outside the project don't become edges or affect exit points."""
+        nss = [
+            _ns("svc.logic.pay", "logic", ["svc.model.pay", "clojure.string"]),
+            _ns("svc.model.pay", "model", ["clojure.string"]),
+            _ns("svc.logic.other", "logic", ["clojure.string"]),
+        ]
+        groups = partition_flow_groups(_structure(nss))
+        assert [g.name for g in groups] == ["flow-other", "flow-pay"]
+        pay = groups[1]
+        assert pay.internal_deps == {"svc.logic.pay": ["svc.model.pay"]}
+        assert pay.entry_points == ["svc.model.pay"]
+        assert pay.exit_points == ["svc.logic.pay"]
+        assert groups[0].internal_deps == {}
+
 
 class TestFlowGroupDataclass:
 
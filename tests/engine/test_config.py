@@ -5,7 +5,6 @@ from __future__ import annotations
 import os
 from decimal import Decimal
 from pathlib import Path
-from unittest.mock import patch
 
 import pytest
 
@@ -73,10 +72,16 @@ class TestEngineConfig:
             config.root_model = "changed"  # type: ignore[misc]
 
 
+@pytest.fixture(scope="module")
+def default_config() -> EngineConfig:
+    """Default-path config, parsed once for the tests that only read it."""
+    return load_config()
+
+
 class TestLoadConfig:
 
-    def test_loads_default_config(self) -> None:
-        config = load_config()
+    def test_loads_default_config(self, default_config: EngineConfig) -> None:
+        config = default_config
         assert config.root_model == "anthropic/claude-opus-4-6"
         assert config.root_extended_thinking is True
         assert config.root_max_iterations == 30
@@ -90,25 +95,26 @@ class TestLoadConfig:
         assert config.root_model == "anthropic/claude-opus-4-6"
         assert config.threshold_tokens == 50000
 
-    def test_env_var_overrides_root_model(self) -> None:
-        with patch.dict(os.environ, {"NUCLODE_ROOT_LM_MODEL": "anthropic/claude-opus-4-6"}):
-            config = load_config()
-            assert config.root_model == "anthropic/claude-opus-4-6"
-
-    def test_env_var_overrides_sub_lm_high(self) -> None:
-        with patch.dict(os.environ, {"NUCLODE_SUB_LM_HIGH_MODEL": "latest-opus"}):
-            config = load_config()
-            assert config.sub_lm_high_model == "anthropic/claude-opus-4-6"
-
-    def test_env_var_overrides_sub_lm_low(self) -> None:
-        with patch.dict(os.environ, {"NUCLODE_SUB_LM_LOW_MODEL": "latest-sonnet"}):
-            config = load_config()
-            assert config.sub_lm_low_model == "anthropic/claude-sonnet-4-6"
-
-    def test_env_var_disables_guardrails(self) -> None:
-        with patch.dict(os.environ, {"NUCLODE_GUARDRAILS_ENABLED": "false"}):
-            config = load_config()
-            assert config.guardrails.enabled is False
+    @pytest.mark.parametrize(
+        ("env_var", "value", "attr", "expected"),
+        [
+            ("NUCLODE_ROOT_LM_MODEL", "anthropic/claude-opus-4-6",
+             "root_model", "anthropic/claude-opus-4-6"),
+            ("NUCLODE_SUB_LM_HIGH_MODEL", "latest-opus",
+             "sub_lm_high_model", "anthropic/claude-opus-4-6"),
+            ("NUCLODE_SUB_LM_LOW_MODEL", "latest-sonnet",
+             "sub_lm_low_model", "anthropic/claude-sonnet-4-6"),
+        ],
+    )
+    def test_env_var_overrides_model(
+        self, monkeypatch: pytest.MonkeyPatch, env_var: str, value: str, attr: str, expected: str
+    ) -> None:
+        monkeypatch.setenv(env_var, value)
+        assert getattr(load_config(), attr) == expected
+
+    def test_env_var_disables_guardrails(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("NUCLODE_GUARDRAILS_ENABLED", "false")
+        assert load_config().guardrails.enabled is False
 
     def test_custom_yaml_config(self, tmp_path: Path) -> None:
         custom = tmp_path / "custom.yaml"
@@ -131,3 +137,13 @@ class TestLoadConfig:
         assert config.threshold_tokens == 25000
         assert config.guardrails.enabled is False
         assert config.guardrails.max_cost_per_run_usd == Decimal("10.00")
+
+    def test_edited_yaml_is_reparsed(self, tmp_path: Path) -> None:
+        custom = tmp_path / "custom.yaml"
+        custom.write_text("engine:\n  threshold_tokens: 100\n", encoding="utf-8")
+        assert load_config(custom).threshold_tokens == 100
+
+        custom.write_text("engine:\n  threshold_tokens: 200\n", encoding="utf-8")
+        mtime_ns = custom.stat().st_mtime_ns + 1_000_000_000
+        os.utime(custom, ns=(mtime_ns, mtime_ns))
+        assert load_config(custom).threshold_tokens == 200
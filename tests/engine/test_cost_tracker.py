@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
 
 import pytest
@@ -63,6 +64,20 @@ class TestCostTrackerRecording:
         tracker.record("anthropic/claude-opus-4-6", input_tokens=1_000_000, output_tokens=1_000_000)
         assert tracker.estimated_cost_usd == Decimal("90.00")
 
+    def test_fractional_price_is_exact(
+        self, default_guardrails: GuardrailsConfig, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        # $0.80/M input, $0.25/M output
+        monkeypatch.setitem(MODEL_PRICING, "test/fractional", {"input": 800_000, "output": 250_000})
+        tracker = CostTracker(default_guardrails)
+        tracker.record("test/fractional", input_tokens=3, output_tokens=7)
+        # 3 * $0.0000008 + 7 * $0.00000025 = $0.00000415
+        assert tracker.estimated_cost_usd == Decimal("0.00000415")
+
+    def test_prices_are_integers(self) -> None:
+        for pricing in MODEL_PRICING.values():
+            assert all(isinstance(price, int) for price in pricing.values())
+
     def test_unknown_model_uses_default_pricing(self, default_guardrails: GuardrailsConfig) -> None:
         tracker = CostTracker(default_guardrails)
         # Unknown model should use conservative (Opus) pricing, not crash
@@ -78,6 +93,28 @@ class TestCostTrackerRecording:
         assert summary.calls_by_model["anthropic/claude-haiku-4-5-20251001"] == 2
         assert summary.calls_by_model["anthropic/claude-sonnet-4-6"] == 1
 
+    def test_record_many_matches_sequential_record(
+        self, default_guardrails: GuardrailsConfig
+    ) -> None:
+        events = [
+            ("anthropic/claude-haiku-4-5-20251001", 1000, 500),
+            ("anthropic/claude-sonnet-4-6", 2000, 100),
+            ("anthropic/claude-haiku-4-5-20251001", 300, 700),
+            ("claude-future-model-99", 10, 10),
+        ]
+        batched = CostTracker(default_guardrails)
+        batched.record_many(events)
+        sequential = CostTracker(default_guardrails)
+        for model, input_tokens, output_tokens in events:
+            sequential.record(model, input_tokens, output_tokens)
+        assert batched.summary() == sequential.summary()
+
+    def test_record_many_empty(self, default_guardrails: GuardrailsConfig) -> None:
+        tracker = CostTracker(default_guardrails)
+        tracker.record_many([])
+        assert tracker.sub_lm_call_count == 0
+        assert tracker.estimated_cost_usd == Decimal("0")
+
 
 class TestGuardrailChecks:
 
@@ -100,12 +137,35 @@ class TestGuardrailChecks:
         # ~$1.00 in costs
         assert tracker.check_guardrails() == GuardrailStatus.EXCEEDED
 
+    def test_exact_threshold_boundary(self, tight_guardrails: GuardrailsConfig) -> None:
+        tracker = CostTracker(tight_guardrails)
+        # Haiku input is $1/M: 499_999 tokens is one micro-dollar short of $0.50
+        tracker.record("anthropic/claude-haiku-4-5-20251001", input_tokens=499_999, output_tokens=0)
+        assert tracker.check_guardrails() == GuardrailStatus.OK
+        tracker.record("anthropic/claude-haiku-4-5-20251001", input_tokens=1, output_tokens=0)
+        assert tracker.estimated_cost_usd == Decimal("0.50")
+        assert tracker.check_guardrails() == GuardrailStatus.WARNING
+
     def test_exceeded_at_max_calls(self, tight_guardrails: GuardrailsConfig) -> None:
         tracker = CostTracker(tight_guardrails)
         for _ in range(5):
             tracker.record("anthropic/claude-haiku-4-5-20251001", input_tokens=1, output_tokens=1)
         assert tracker.check_guardrails() == GuardrailStatus.EXCEEDED
 
+    def test_record_many_escalates_status(self, tight_guardrails: GuardrailsConfig) -> None:
+        tracker = CostTracker(tight_guardrails)
+        tracker.record_many([("anthropic/claude-opus-4-6", 40_000, 0)] * 2)
+        assert tracker.check_guardrails() == GuardrailStatus.EXCEEDED
+
+    def test_concurrent_records_reach_exceeded(self, tight_guardrails: GuardrailsConfig) -> None:
+        tracker = CostTracker(tight_guardrails)
+        # 4 x 20_000 Opus input tokens = $1.20: crosses both the $0.50 and $1.00 marks
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            for _ in range(4):
+                pool.submit(tracker.record, "anthropic/claude-opus-4-6", 20_000, 0)
+        assert tracker.estimated_cost_usd == Decimal("1.20")
+        assert tracker.check_guardrails() == GuardrailStatus.EXCEEDED
+
     def test_disabled_guardrails_always_ok(self, disabled_guardrails: GuardrailsConfig) -> None:
         tracker = CostTracker(disabled_guardrails)
         tracker.record("anthropic/claude-opus-4-6", input_tokens=10_000_000, output_tokens=10_000_000)
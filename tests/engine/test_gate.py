@@ -19,37 +19,49 @@ from knowledge.engine.gate import (
 )
 
 
-# ---------------------------------------------------------------------------
-# estimate_tokens
-# ---------------------------------------------------------------------------
+@pytest.fixture(scope="module")
+def big_x() -> str:
+    """400K-char string shared by the large-context tests; slice for smaller sizes."""
+    return "x" * 400_000
 
 
-class TestEstimateTokensString:
-    """Token estimation from plain string context."""
+_PAYLOAD_9K = "x" * 9_000
 
-    def test_empty_string(self) -> None:
-        assert estimate_tokens("") == 0
 
-    def test_short_string(self) -> None:
-        # 12 chars / 4 = 3 tokens
-        assert estimate_tokens("hello world!") == 3
+@pytest.fixture(scope="module")
+def big_dict() -> dict[str, str]:
+    """200-namespace BFF context (~450K tokens), built once per module. Read-only.
 
-    def test_exact_multiple(self) -> None:
-        # 8 chars / 4 = 2 tokens exactly
-        text = "abcdefgh"
-        assert estimate_tokens(text) == 2
+    Every value is the same 9K-char string object; only the keys differ.
+    """
+    return dict.fromkeys((f"ns_{i}.clj" for i in range(200)), _PAYLOAD_9K)
 
-    def test_rounds_down(self) -> None:
-        # 5 chars / 4 = 1 (integer division rounds down)
-        assert estimate_tokens("abcde") == 1
 
-    def test_single_char(self) -> None:
-        # 1 char / 4 = 0
-        assert estimate_tokens("x") == 0
+# ---------------------------------------------------------------------------
+# estimate_tokens
+# ---------------------------------------------------------------------------
 
-    def test_large_string(self) -> None:
+
+class TestEstimateTokensString:
+    """Token estimation from plain string context."""
+
+    @pytest.mark.parametrize(
+        ("text", "expected"),
+        [
+            ("", 0),
+            ("hello world!", 3),  # 12 chars / 4
+            ("abcdefgh", 2),  # exact multiple
+            ("abcde", 1),  # integer division rounds down
+            ("x", 0),
+        ],
+        ids=["empty", "short", "exact_multiple", "rounds_down", "single_char"],
+    )
+    def test_small_strings(self, text: str, expected: int) -> None:
+        assert estimate_tokens(text) == expected
+
+    def test_large_string(self, big_x: str) -> None:
         # 200,000 chars / 4 = 50,000 tokens
-        text = "x" * 200_000
+        text = big_x[:200_000]
         assert estimate_tokens(text) == 50_000
 
     def test_realistic_code_string(self) -> None:
@@ -85,11 +97,12 @@ class TestEstimateTokensDict:
         context = {"count": 12345}  # str(12345) = "12345", 5 chars -> 1 token
         assert estimate_tokens(context) == 1
 
-    def test_large_dict_context(self) -> None:
-        # Simulate a 200-namespace BFF: ~450K tokens worth of source
-        context = {f"ns_{i}.clj": "x" * 9_000 for i in range(200)}
-        # 200 * 9000 = 1,800,000 chars / 4 = 450,000 tokens
-        assert estimate_tokens(context) == 450_000
+    def test_many_entries_summed(self) -> None:
+        # 200 namespaces exercise the summing path; the full-size BFF case
+        # lives in TestDesignDocScenarios.test_large_bff_200_namespaces_fan_out.
+        context = dict.fromkeys((f"ns_{i}.clj" for i in range(200)), "x" * 90)
+        # 200 * 90 = 18,000 chars / 4 = 4,500 tokens
+        assert estimate_tokens(context) == 4_500
 
 
 class TestEstimateTokensTypeError:
@@ -116,26 +129,25 @@ class TestEstimateTokensTypeError:
 class TestShouldFanOut:
     """Stage 1 threshold check."""
 
-    def test_below_threshold(self) -> None:
-        assert should_fan_out(49_999) is False
-
-    def test_at_threshold(self) -> None:
-        assert should_fan_out(50_000) is True
-
-    def test_above_threshold(self) -> None:
-        assert should_fan_out(100_000) is True
-
-    def test_zero_tokens(self) -> None:
-        assert should_fan_out(0) is False
-
-    def test_custom_threshold_below(self) -> None:
-        assert should_fan_out(999, threshold=1_000) is False
-
-    def test_custom_threshold_at(self) -> None:
-        assert should_fan_out(1_000, threshold=1_000) is True
-
-    def test_custom_threshold_above(self) -> None:
-        assert should_fan_out(1_001, threshold=1_000) is True
+    @pytest.mark.parametrize(
+        ("token_count", "threshold", "expected"),
+        [
+            (49_999, None, False),
+            (50_000, None, True),
+            (100_000, None, True),
+            (0, None, False),
+            (999, 1_000, False),
+            (1_000, 1_000, True),
+            (1_001, 1_000, True),
+        ],
+        ids=[
+            "below", "at", "above", "zero",
+            "custom_below", "custom_at", "custom_above",
+        ],
+    )
+    def test_threshold(self, token_count: int, threshold: int | None, expected: bool) -> None:
+        kwargs = {} if threshold is None else {"threshold": threshold}
+        assert should_fan_out(token_count, **kwargs) is expected
 
 
 # ---------------------------------------------------------------------------
@@ -188,14 +200,14 @@ class TestRouteTaskStage1:
         assert decision.token_count == 10
         assert decision.stage == "threshold"
 
-    def test_large_string_routes_fan_out(self) -> None:
-        decision = route_task("x" * 200_000)
+    def test_large_string_routes_fan_out(self, big_x: str) -> None:
+        decision = route_task(big_x[:200_000])
         assert decision.fan_out is True
         assert decision.token_count == 50_000
         assert decision.stage == "threshold"
 
-    def test_above_threshold_string(self) -> None:
-        decision = route_task("x" * 400_000)
+    def test_above_threshold_string(self, big_x: str) -> None:
+        decision = route_task(big_x)
         assert decision.fan_out is True
         assert decision.token_count == 100_000
 
@@ -211,8 +223,8 @@ class TestRouteTaskStage1:
         assert decision.fan_out is False
         assert decision.token_count == 50
 
-    def test_dict_context_above_threshold(self) -> None:
-        context = {f"ns_{i}.clj": "x" * 10_000 for i in range(100)}
+    def test_dict_context_above_threshold(self, big_x: str) -> None:
+        context = dict.fromkeys((f"ns_{i}.clj" for i in range(100)), big_x[:10_000])
         decision = route_task(context)
         assert decision.fan_out is True
         assert decision.token_count == 250_000
@@ -246,10 +258,9 @@ class TestRouteTaskStage2:
         assert decision.stage == "opus_override"
         assert decision.token_count == 10
 
-    def test_opus_override_false_forces_direct(self) -> None:
-        large_context = "x" * 400_000
+    def test_opus_override_false_forces_direct(self, big_x: str) -> None:
         decision = route_task(
-            large_context,
+            big_x,
             structure_summary={"opus_override": False},
         )
         assert decision.fan_out is False
@@ -268,9 +279,9 @@ class TestRouteTaskStage2:
         assert decision.reason == "Complex protocols detected despite small size"
         assert decision.stage == "opus_override"
 
-    def test_opus_override_false_with_custom_reason(self) -> None:
+    def test_opus_override_false_with_custom_reason(self, big_x: str) -> None:
         decision = route_task(
-            "x" * 400_000,
+            big_x,
             structure_summary={
                 "opus_override": False,
                 "opus_reason": "Flat architecture, I can handle this directly",
@@ -318,20 +329,19 @@ class TestDesignDocScenarios:
         assert decision.fan_out is False
         assert decision.token_count < DEFAULT_THRESHOLD
 
-    def test_medium_service_35_namespaces_fan_out(self) -> None:
-        context = {f"ns_{i}.clj": "x" * 9_000 for i in range(35)}
+    def test_medium_service_35_namespaces_fan_out(self, big_dict: dict[str, str]) -> None:
+        context = dict(list(big_dict.items())[:35])
         decision = route_task(context)
         assert decision.fan_out is True
         assert decision.token_count > DEFAULT_THRESHOLD
 
-    def test_large_bff_200_namespaces_fan_out(self) -> None:
-        context = {f"ns_{i}.clj": "x" * 9_000 for i in range(200)}
-        decision = route_task(context)
+    def test_large_bff_200_namespaces_fan_out(self, big_dict: dict[str, str]) -> None:
+        decision = route_task(big_dict)
         assert decision.fan_out is True
         assert decision.token_count == 450_000
 
-    def test_60k_tokens_but_opus_says_direct(self) -> None:
-        context = "x" * 240_000
+    def test_60k_tokens_but_opus_says_direct(self, big_x: str) -> None:
+        context = big_x[:240_000]
         decision = route_task(
             context,
             structure_summary={
@@ -342,8 +352,8 @@ class TestDesignDocScenarios:
         assert decision.fan_out is False
         assert decision.stage == "opus_override"
 
-    def test_30k_tokens_but_opus_says_fan_out(self) -> None:
-        context = "x" * 120_000
+    def test_30k_tokens_but_opus_says_fan_out(self, big_x: str) -> None:
+        context = big_x[:120_000]
         decision = route_task(
             context,
             structure_summary={
@@ -2,20 +2,22 @@
 
 from __future__ import annotations
 
+import functools
 import json
 from decimal import Decimal
-from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import Mock, patch
 
 import pytest
 
-from knowledge.backends.base import NamespaceInfo
 from knowledge.engine.chunking import FlowGroup
 from knowledge.engine.config import EngineConfig, GuardrailsConfig
 from knowledge.engine.pipeline import PipelineResult, PipelineRunner
 
+_MAX_COST = Decimal("10.00")
+_WARN_COST = Decimal("5.00")
 
-@pytest.fixture
+
+@pytest.fixture(scope="module")
 def config() -> EngineConfig:
     return EngineConfig(
         root_model="anthropic/claude-opus-4-6",
@@ -26,13 +28,14 @@ def config() -> EngineConfig:
         threshold_tokens=50000,
         guardrails=GuardrailsConfig(
             enabled=True,
-            max_cost_per_run_usd=Decimal("10.00"),
-            warn_cost_threshold_usd=Decimal("5.00"),
+            max_cost_per_run_usd=_MAX_COST,
+            warn_cost_threshold_usd=_WARN_COST,
             max_sub_lm_calls=100,
         ),
     )
 
 
+@functools.lru_cache(maxsize=None)
 def _valid_response(flow_name: str = "flow-test") -> str:
     return json.dumps({
         "flow_name": flow_name,
@@ -57,8 +60,8 @@ def _make_group(name: str = "flow-a") -> FlowGroup:
 
 class TestPipelineRunner:
 
-    @patch.object(PipelineRunner, "_call_sub_lm_for_group")
-    def test_runs_all_groups(self, mock_call: MagicMock, config: EngineConfig) -> None:
+    @patch.object(PipelineRunner, "_call_sub_lm_for_group", new_callable=Mock)
+    def test_runs_all_groups(self, mock_call: Mock, config: EngineConfig) -> None:
         mock_call.return_value = _valid_response()
         groups = [_make_group("flow-a"), _make_group("flow-b")]
         runner = PipelineRunner(config)
@@ -67,8 +70,8 @@ class TestPipelineRunner:
         assert len(result.analyses) == 2
         assert mock_call.call_count == 2
 
-    @patch.object(PipelineRunner, "_call_sub_lm_for_group")
-    def test_validation_failure_retries_once(self, mock_call: MagicMock, config: EngineConfig) -> None:
+    @patch.object(PipelineRunner, "_call_sub_lm_for_group", new_callable=Mock)
+    def test_validation_failure_retries_once(self, mock_call: Mock, config: EngineConfig) -> None:
         mock_call.side_effect = ["not json", _valid_response()]
         groups = [_make_group()]
         runner = PipelineRunner(config)
@@ -76,8 +79,21 @@ class TestPipelineRunner:
         assert result.status == "completed"
         assert mock_call.call_count == 2  # first fails validation, retry succeeds
 
-    @patch.object(PipelineRunner, "_call_sub_lm_for_group")
-    def test_persistent_validation_failure_captured(self, mock_call: MagicMock, config: EngineConfig) -> None:
+    @patch.object(PipelineRunner, "_call_sub_lm_for_group", new_callable=Mock)
+    def test_retry_reuses_rendered_prompt(self, mock_call: Mock, config: EngineConfig) -> None:
+        mock_call.side_effect = ["not json", _valid_response()]
+        runner = PipelineRunner(config)
+        with patch(
+            "knowledge.recipes.codebase_analysis.prompts.build_flow_group_prompt",
+            return_value="rendered prompt",
+        ) as mock_build:
+            runner.run([_make_group()], source_by_namespace={})
+        mock_build.assert_called_once()
+        retry_prompt = mock_call.call_args_list[1].args[0]
+        assert retry_prompt.startswith("rendered prompt\n\nPrevious attempt failed validation")
+
+    @patch.object(PipelineRunner, "_call_sub_lm_for_group", new_callable=Mock)
+    def test_persistent_validation_failure_captured(self, mock_call: Mock, config: EngineConfig) -> None:
         mock_call.return_value = "not json at all"
         groups = [_make_group()]
         runner = PipelineRunner(config)
@@ -85,24 +101,24 @@ class TestPipelineRunner:
         assert result.status == "completed_with_errors"
         assert len(result.validation_errors) == 1
 
-    @patch.object(PipelineRunner, "_call_sub_lm_for_group")
-    def test_cost_tracked(self, mock_call: MagicMock, config: EngineConfig) -> None:
+    @patch.object(PipelineRunner, "_call_sub_lm_for_group", new_callable=Mock)
+    def test_cost_tracked(self, mock_call: Mock, config: EngineConfig) -> None:
         mock_call.return_value = _valid_response()
         groups = [_make_group()]
         runner = PipelineRunner(config)
         result = runner.run(groups, source_by_namespace={})
         assert "total_cost_usd" in result.cost_summary
 
-    @patch.object(PipelineRunner, "_call_sub_lm_for_group")
-    def test_empty_groups(self, mock_call: MagicMock, config: EngineConfig) -> None:
+    @patch.object(PipelineRunner, "_call_sub_lm_for_group", new_callable=Mock)
+    def test_empty_groups(self, mock_call: Mock, config: EngineConfig) -> None:
         runner = PipelineRunner(config)
         result = runner.run([], source_by_namespace={})
         assert result.status == "completed"
         assert result.groups_total == 0
         mock_call.assert_not_called()
 
-    @patch.object(PipelineRunner, "_call_sub_lm_for_group")
-    def test_groups_succeeded_count(self, mock_call: MagicMock, config: EngineConfig) -> None:
+    @patch.object(PipelineRunner, "_call_sub_lm_for_group", new_callable=Mock)
+    def test_groups_succeeded_count(self, mock_call: Mock, config: EngineConfig) -> None:
         mock_call.side_effect = [_valid_response("flow-a"), "bad json", "bad json"]
         groups = [_make_group("flow-a"), _make_group("flow-b")]
         runner = PipelineRunner(config)
@@ -110,6 +126,27 @@ class TestPipelineRunner:
         assert result.groups_total == 2
         assert result.groups_succeeded == 1
 
+    @pytest.mark.parametrize(
+        "responses",
+        [[_valid_response("flow-name")], ["not json", _valid_response("flow-name")]],
+        ids=["first_attempt", "retry"],
+    )
+    @patch.object(PipelineRunner, "_call_sub_lm_for_group", new_callable=Mock)
+    def test_group_identity_overrides_echoed_fields(
+        self, mock_call: Mock, config: EngineConfig, responses: list[str]
+    ) -> None:
+        mock_call.side_effect = responses
+        group = FlowGroup(
+            name="flow-payment", namespaces=[], entry_points=["svc.wire.in.payment"],
+            exit_points=["svc.logic.payment"], internal_deps={},
+        )
+        runner = PipelineRunner(config)
+        result = runner.run([group], source_by_namespace={})
+        [analysis] = result.analyses
+        assert analysis["flow_name"] == "flow-payment"
+        assert analysis["entry_points"] == ["svc.wire.in.payment"]
+        assert analysis["exit_points"] == ["svc.logic.payment"]
+
 
 class TestPipelineResult:
 
@@ -5,17 +5,27 @@ Tests mock the Anthropic API — no real API calls are made.
 
 from __future__ import annotations
 
+import dataclasses
 from decimal import Decimal
-from unittest.mock import MagicMock, patch
+from unittest.mock import Mock, patch
 
 import pytest
 
 from knowledge.engine.config import EngineConfig, GuardrailsConfig
-from knowledge.engine.gate import GateDecision
-from knowledge.engine.runner import EngineRunner, _strip_code_fences
+from knowledge.engine.cost_tracker import CostTracker
+from knowledge.engine.runner import EngineResult, EngineRunner, _strip_code_fences
 
+_MAX_COST = Decimal("10.00")
+_WARN_COST = Decimal("5.00")
 
-@pytest.fixture
+# Just above the 50K-token threshold, so run() takes the REPL loop path.
+_LARGE_CONTEXT = "x" * 200_001
+
+# Shared empty tool map; run() only reads custom_tools.
+_NO_TOOLS: dict[str, dict] = {}
+
+
+@pytest.fixture(scope="module")
 def config() -> EngineConfig:
     return EngineConfig(
         root_model="anthropic/claude-opus-4-6",
@@ -26,18 +36,31 @@ def config() -> EngineConfig:
         threshold_tokens=50000,
         guardrails=GuardrailsConfig(
             enabled=True,
-            max_cost_per_run_usd=Decimal("10.00"),
-            warn_cost_threshold_usd=Decimal("5.00"),
+            max_cost_per_run_usd=_MAX_COST,
+            warn_cost_threshold_usd=_WARN_COST,
             max_sub_lm_calls=10,
         ),
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def runner(config: EngineConfig) -> EngineRunner:
     return EngineRunner(config)
 
 
+@pytest.fixture(autouse=True)
+def reset_cost(runner: EngineRunner, config: EngineConfig) -> None:
+    """Give each test a fresh cost tracker on the shared runner."""
+    runner._cost_tracker = CostTracker(config.guardrails)
+
+
+def _run_loop(
+    runner: EngineRunner, tools: dict[str, dict] = _NO_TOOLS, system: str = "Analyze."
+) -> EngineResult:
+    """Run the REPL loop path on the large context."""
+    return runner.run(_LARGE_CONTEXT, custom_tools=tools, system_prompt=system)
+
+
 class TestStripCodeFences:
 
     def test_strips_python_fences(self) -> None:
@@ -75,8 +98,8 @@ class TestStripCodeFences:
 class TestRunDirect:
     """Test the below-threshold direct LM call path."""
 
-    @patch.object(EngineRunner, "_call_root_lm")
-    def test_small_context_routes_direct(self, mock_lm: MagicMock, runner: EngineRunner) -> None:
+    @patch.object(EngineRunner, "_call_root_lm", new_callable=Mock)
+    def test_small_context_routes_direct(self, mock_lm: Mock, runner: EngineRunner) -> None:
         mock_lm.return_value = "Analysis result"
         result = runner.run("small context")
 
@@ -85,8 +108,8 @@ class TestRunDirect:
         assert result.gate_decision.fan_out is False
         assert result.output == "Analysis result"
 
-    @patch.object(EngineRunner, "_call_root_lm")
-    def test_direct_error_returns_error_status(self, mock_lm: MagicMock, runner: EngineRunner) -> None:
+    @patch.object(EngineRunner, "_call_root_lm", new_callable=Mock)
+    def test_direct_error_returns_error_status(self, mock_lm: Mock, runner: EngineRunner) -> None:
         mock_lm.side_effect = RuntimeError("API error")
         result = runner.run("small context")
 
@@ -94,99 +117,90 @@ class TestRunDirect:
         assert "API error" in result.error
 
 
+@pytest.mark.repl
 class TestRunReplLoop:
     """Test the REPL loop path."""
 
-    @patch.object(EngineRunner, "_call_root_lm")
-    def test_final_terminates_loop(self, mock_lm: MagicMock, runner: EngineRunner) -> None:
+    @patch.object(EngineRunner, "_call_root_lm", new_callable=Mock)
+    def test_final_terminates_loop(self, mock_lm: Mock, runner: EngineRunner) -> None:
         # Root LM returns code that calls FINAL()
         mock_lm.return_value = 'FINAL("done")'
 
-        result = runner.run(
-            "x" * 200_001,  # above 50K token threshold
-            custom_tools={},
-            system_prompt="Analyze this.",
-        )
+        result = _run_loop(runner, system="Analyze this.")
 
         assert result.status == "completed"
         assert result.output == "done"
         assert result.iterations == 1
 
-    @patch.object(EngineRunner, "_call_root_lm")
-    def test_max_iterations_stops_loop(self, mock_lm: MagicMock, runner: EngineRunner) -> None:
-        # Root LM never calls FINAL
+    @patch.object(EngineRunner, "_call_root_lm", new_callable=Mock)
+    def test_max_iterations_stops_loop(self, mock_lm: Mock, config: EngineConfig) -> None:
+        # Root LM never calls FINAL; a low cap keeps the loop short
+        runner = EngineRunner(dataclasses.replace(config, root_max_iterations=2))
         mock_lm.return_value = 'print("still working")'
 
-        result = runner.run(
-            "x" * 200_001,
-            custom_tools={},
-            system_prompt="Analyze.",
-        )
+        result = _run_loop(runner)
 
         assert result.status == "max_iterations"
-        assert result.iterations == 5  # matches config.root_max_iterations
+        assert result.iterations == 2  # matches root_max_iterations
+        assert mock_lm.call_count == 2
 
-    @patch.object(EngineRunner, "_call_root_lm")
-    def test_code_error_continues_loop(self, mock_lm: MagicMock, runner: EngineRunner) -> None:
+    @patch.object(EngineRunner, "_call_root_lm", new_callable=Mock)
+    def test_code_error_continues_loop(self, mock_lm: Mock, runner: EngineRunner) -> None:
         # First call raises, second calls FINAL
         mock_lm.side_effect = [
             "1/0",  # ZeroDivisionError
             'FINAL("recovered")',
         ]
 
-        result = runner.run(
-            "x" * 200_001,
-            custom_tools={},
-            system_prompt="Analyze.",
-        )
+        result = _run_loop(runner)
 
         assert result.status == "completed"
         assert result.output == "recovered"
         assert result.iterations == 2
 
-    @patch.object(EngineRunner, "_call_root_lm")
-    def test_custom_tools_available_in_namespace(self, mock_lm: MagicMock, runner: EngineRunner) -> None:
+    @patch.object(EngineRunner, "_call_root_lm", new_callable=Mock)
+    def test_custom_tools_available_in_namespace(self, mock_lm: Mock, runner: EngineRunner) -> None:
         # Root LM code calls a custom tool
         mock_lm.return_value = 'result = my_tool("arg")\nFINAL(result)'
 
-        tool_fn = MagicMock(return_value="tool_result")
+        tool_fn = Mock(return_value="tool_result")
         custom_tools = {
             "my_tool": {"tool": tool_fn, "description": "A test tool"},
         }
 
-        result = runner.run(
-            "x" * 200_001,
-            custom_tools=custom_tools,
-            system_prompt="Use tools.",
-        )
+        result = _run_loop(runner, tools=custom_tools, system="Use tools.")
 
         assert result.status == "completed"
         assert result.output == "tool_result"
         tool_fn.assert_called_once_with("arg")
 
-    @patch.object(EngineRunner, "_call_root_lm")
-    def test_print_captures_output(self, mock_lm: MagicMock, runner: EngineRunner) -> None:
+    @patch.object(EngineRunner, "_call_root_lm", new_callable=Mock)
+    def test_print_captures_output(
+        self, mock_lm: Mock, runner: EngineRunner, capsys: pytest.CaptureFixture[str]
+    ) -> None:
         # First iteration prints, second calls FINAL
         mock_lm.side_effect = [
             'print("hello world")',
             'FINAL("done")',
         ]
 
-        result = runner.run(
-            "x" * 200_001,
-            custom_tools={},
-            system_prompt="Analyze.",
-        )
+        result = _run_loop(runner)
 
         assert result.status == "completed"
         assert result.iterations == 2
+        # The runner captures exec() output itself and feeds it to the next turn;
+        # nothing reaches the process stdout.
+        _, second_user_content = mock_lm.call_args_list[1].args
+        assert "hello world" in second_user_content
+        assert "hello world" not in capsys.readouterr().out
 
 
+@pytest.mark.repl
 class TestBudgetGuardrails:
     """Test that guardrails stop the run when exceeded."""
 
-    @patch.object(EngineRunner, "_call_root_lm")
-    def test_budget_exceeded_stops_loop(self, mock_lm: MagicMock, config: EngineConfig) -> None:
+    @patch.object(EngineRunner, "_call_root_lm", new_callable=Mock)
+    def test_budget_exceeded_stops_loop(self, mock_lm: Mock, config: EngineConfig) -> None:
         runner = EngineRunner(config)
         # Simulate expensive calls by pre-loading the cost tracker
         runner._cost_tracker.record("anthropic/claude-opus-4-6", input_tokens=1_000_000, output_tokens=0)
@@ -194,48 +208,37 @@ class TestBudgetGuardrails:
 
         mock_lm.return_value = 'print("should not run")'
 
-        result = runner.run(
-            "x" * 200_001,
-            custom_tools={},
-            system_prompt="Analyze.",
-        )
+        result = _run_loop(runner)
 
         assert result.status == "budget_exceeded"
 
 
+@pytest.mark.repl
 class TestSubLmCalls:
     """Test sub-LM call dispatch."""
 
-    @patch.object(EngineRunner, "_call_root_lm")
-    @patch.object(EngineRunner, "_call_sub_lm")
-    def test_llm_query_in_code(self, mock_sub: MagicMock, mock_root: MagicMock, runner: EngineRunner) -> None:
+    @patch.object(EngineRunner, "_call_root_lm", new_callable=Mock)
+    @patch.object(EngineRunner, "_call_sub_lm", new_callable=Mock)
+    def test_llm_query_in_code(self, mock_sub: Mock, mock_root: Mock, runner: EngineRunner) -> None:
         mock_sub.return_value = "sub result"
         mock_root.return_value = 'result = llm_query("analyze this", tier="high")\nFINAL(result)'
 
-        result = runner.run(
-            "x" * 200_001,
-            custom_tools={},
-            system_prompt="Analyze.",
-        )
+        result = _run_loop(runner)
 
         assert result.status == "completed"
         assert result.output == "sub result"
         mock_sub.assert_called_once_with("analyze this", "high")
 
-    @patch.object(EngineRunner, "_call_root_lm")
-    @patch.object(EngineRunner, "_call_sub_lm")
-    def test_llm_query_batched_in_code(self, mock_sub: MagicMock, mock_root: MagicMock, runner: EngineRunner) -> None:
+    @patch.object(EngineRunner, "_call_root_lm", new_callable=Mock)
+    @patch.object(EngineRunner, "_call_sub_lm", new_callable=Mock)
+    def test_llm_query_batched_in_code(self, mock_sub: Mock, mock_root: Mock, runner: EngineRunner) -> None:
         mock_sub.side_effect = ["result1", "result2"]
         mock_root.return_value = (
             'results = llm_query_batched(["prompt1", "prompt2"], tier="low")\n'
             'FINAL(results)'
         )
 
-        result = runner.run(
-            "x" * 200_001,
-            custom_tools={},
-            system_prompt="Analyze.",
-        )
+        result = _run_loop(runner)
 
         assert result.status == "completed"
         assert result.output == ["result1", "result2"]
@@ -245,16 +248,16 @@ class TestSubLmCalls:
 class TestGateDecisionInResult:
     """Verify the gate decision is captured in the result."""
 
-    @patch.object(EngineRunner, "_call_root_lm")
-    def test_direct_path_captures_gate(self, mock_lm: MagicMock, runner: EngineRunner) -> None:
+    @patch.object(EngineRunner, "_call_root_lm", new_callable=Mock)
+    def test_direct_path_captures_gate(self, mock_lm: Mock, runner: EngineRunner) -> None:
         mock_lm.return_value = "result"
         result = runner.run("small")
         assert result.gate_decision.fan_out is False
         assert result.gate_decision.stage == "threshold"
 
-    @patch.object(EngineRunner, "_call_root_lm")
-    def test_fan_out_path_captures_gate(self, mock_lm: MagicMock, runner: EngineRunner) -> None:
+    @patch.object(EngineRunner, "_call_root_lm", new_callable=Mock)
+    def test_fan_out_path_captures_gate(self, mock_lm: Mock, runner: EngineRunner) -> None:
         mock_lm.return_value = 'FINAL("done")'
-        result = runner.run("x" * 200_001)
+        result = runner.run(_LARGE_CONTEXT)
         assert result.gate_decision.fan_out is True
         assert result.gate_decision.stage == "threshold"
@@ -3,45 +3,57 @@
 from __future__ import annotations
 
 import json
+import re
 
 import pytest
 
-from knowledge.engine.schema import FLOW_ANALYSIS_SCHEMA, validate_flow_analysis, ValidationError
+from knowledge.engine.schema import (
+    FLOW_ANALYSIS_SCHEMA,
+    ValidationError,
+    _extract_json,
+    validate_flow_analysis,
+)
+
+_MISSING_REQUIRED = re.compile("missing required")
+_INVALID_JSON = re.compile("Invalid JSON")
+_NAMESPACE_MISSING_NAME = re.compile("namespace.*missing.*name")
+_DATA_FLOW_MISSING_FROM = re.compile("data_flow.*missing.*from")
+
+_VALID_MINIMAL_JSON = json.dumps({
+    "flow_name": "payment",
+    "entry_points": ["svc.wire.in.payment"],
+    "exit_points": ["svc.diplomat.datomic.payment"],
+    "namespaces": [
+        {
+            "name": "svc.wire.in.payment",
+            "layer": "wire-in",
+            "role": "Input schema for payment requests",
+            "side_effects": [],
+            "security_notes": None,
+        }
+    ],
+    "data_flow": [
+        {"from": "svc.wire.in.payment", "to": "svc.adapter.payment", "transforms": "wire-to-model"}
+    ],
+    "bottlenecks": [],
+    "security_findings": [],
+    "coupling_issues": [],
+})
 
 
 class TestValidateFlowAnalysis:
 
     def test_valid_minimal(self) -> None:
-        data = {
-            "flow_name": "payment",
-            "entry_points": ["svc.wire.in.payment"],
-            "exit_points": ["svc.diplomat.datomic.payment"],
-            "namespaces": [
-                {
-                    "name": "svc.wire.in.payment",
-                    "layer": "wire-in",
-                    "role": "Input schema for payment requests",
-                    "side_effects": [],
-                    "security_notes": None,
-                }
-            ],
-            "data_flow": [
-                {"from": "svc.wire.in.payment", "to": "svc.adapter.payment", "transforms": "wire-to-model"}
-            ],
-            "bottlenecks": [],
-            "security_findings": [],
-            "coupling_issues": [],
-        }
-        result = validate_flow_analysis(json.dumps(data))
+        result = validate_flow_analysis(_VALID_MINIMAL_JSON)
         assert result["flow_name"] == "payment"
 
     def test_rejects_missing_required_field(self) -> None:
         data = {"flow_name": "payment"}
-        with pytest.raises(ValidationError, match="missing required"):
+        with pytest.raises(ValidationError, match=_MISSING_REQUIRED):
             validate_flow_analysis(json.dumps(data))
 
     def test_rejects_invalid_json(self) -> None:
-        with pytest.raises(ValidationError, match="Invalid JSON"):
+        with pytest.raises(ValidationError, match=_INVALID_JSON):
             validate_flow_analysis("not json {{{")
 
     def test_rejects_namespace_missing_name(self) -> None:
@@ -55,7 +67,7 @@ class TestValidateFlowAnalysis:
             "security_findings": [],
             "coupling_issues": [],
         }
-        with pytest.raises(ValidationError, match="namespace.*missing.*name"):
+        with pytest.raises(ValidationError, match=_NAMESPACE_MISSING_NAME):
             validate_flow_analysis(json.dumps(data))
 
     def test_rejects_data_flow_missing_from(self) -> None:
@@ -69,25 +81,28 @@ class TestValidateFlowAnalysis:
             "security_findings": [],
             "coupling_issues": [],
         }
-        with pytest.raises(ValidationError, match="data_flow.*missing.*from"):
+        with pytest.raises(ValidationError, match=_DATA_FLOW_MISSING_FROM):
             validate_flow_analysis(json.dumps(data))
 
     def test_extracts_json_from_markdown(self) -> None:
-        data = {
-            "flow_name": "payment",
-            "entry_points": [],
-            "exit_points": [],
-            "namespaces": [],
-            "data_flow": [],
-            "bottlenecks": [],
-            "security_findings": [],
-            "coupling_issues": [],
-        }
-        wrapped = f"Here is the analysis:\n```json\n{json.dumps(data)}\n```"
+        wrapped = f"Here is the analysis:\n```json\n{_VALID_MINIMAL_JSON}\n```"
         result = validate_flow_analysis(wrapped)
         assert result["flow_name"] == "payment"
 
 
+class TestExtractJson:
+
+    def test_strips_json_fence(self) -> None:
+        wrapped = f"Here is the analysis:\n```json\n{_VALID_MINIMAL_JSON}\n```"
+        assert _extract_json(wrapped) == _VALID_MINIMAL_JSON
+
+    def test_strips_plain_fence(self) -> None:
+        assert _extract_json(f"```\n{_VALID_MINIMAL_JSON}\n```") == _VALID_MINIMAL_JSON
+
+    def test_bare_object_in_prose(self) -> None:
+        assert _extract_json('Result: {"a": 1} done') == '{"a": 1}'
+
+
 class TestSchemaConstant:
 
     def test_schema_has_required_fields(self) -> None:
@@ -17,9 +17,10 @@ from knowledge.engine.schema import validate_flow_analysis
 from knowledge.recipes.codebase_analysis.context_loader import load_codebase_context, load_source_map
 
 
-@pytest.fixture
-def clojure_project(tmp_path: Path) -> Path:
-    """Create a realistic mini Diplomat service."""
+@pytest.fixture(scope="session")
+def clojure_project(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create a realistic mini Diplomat service, once per session (tests only read it)."""
+    tmp_path = tmp_path_factory.mktemp("clojure_project")
     src = tmp_path / "src" / "svc"
     for sub in ["wire/in", "adapters", "controllers", "logic", "models", "diplomat/datomic"]:
         (src / sub.replace("/", "/")).mkdir(parents=True, exist_ok=True)
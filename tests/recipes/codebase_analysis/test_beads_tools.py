@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import subprocess
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -23,7 +25,7 @@ from knowledge.recipes.codebase_analysis.beads_tools import (
 def mock_run():
     """Mock subprocess.run to capture arguments without running bd."""
     with patch("knowledge.recipes.codebase_analysis.beads_tools.subprocess.run") as mock:
-        mock.return_value = MagicMock(returncode=0, stdout="bead-123\n", stderr="")
+        mock.return_value = SimpleNamespace(returncode=0, stdout="bead-123\n", stderr="")
         yield mock
 
 
@@ -192,6 +194,16 @@ class TestRunBd:
         assert "--db" not in args
         assert args == ["bd", "create", "Title", "-d", "Body", "--silent"]
 
+    def test_fire_and_forget_ops_discard_stdout(self, mock_run: MagicMock) -> None:
+        comment_bead("bead-1", "note")
+        kwargs = mock_run.call_args[1]
+        assert kwargs["stdout"] is subprocess.DEVNULL
+        assert "text" not in kwargs
+
+    def test_fire_and_forget_failure_returns_false(self, mock_run: MagicMock) -> None:
+        mock_run.return_value = SimpleNamespace(returncode=1, stderr=b"no such bead")
+        assert close_bead("bead-1", "done") is False
+
 
 class TestGetCustomTools:
 
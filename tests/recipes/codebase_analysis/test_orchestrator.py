@@ -11,15 +11,14 @@ import subprocess
 import textwrap
 from decimal import Decimal
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from knowledge.backends.clojure_nrepl import ClojureNREPLBackend
 from knowledge.engine.config import EngineConfig, GuardrailsConfig
-from knowledge.engine.gate import GateDecision
 from knowledge.engine.pipeline import PipelineResult, PipelineRunner
-from knowledge.engine.runner import EngineResult, EngineRunner
 from knowledge.recipes.codebase_analysis.orchestrator import (
     AnalysisResult,
     CodebaseAnalyzer,
@@ -31,12 +30,31 @@ from knowledge.recipes.codebase_analysis.orchestrator import (
 )
 
 
+_CORE_CLJ = textwrap.dedent("""\
+    (ns nu.svc.logic.core
+      (:require [nu.svc.model.data :as data]))
+    (defn process [x] (data/transform x))
+""").encode("utf-8")
+
+_DATA_CLJ = textwrap.dedent("""\
+    (ns nu.svc.model.data)
+    (defn transform [x] {:result x})
+""").encode("utf-8")
+
+_MAX_COST = Decimal("10.00")
+_WARN_COST = Decimal("5.00")
+
+_METADATA_BYTES = json.dumps(
+    {"commit_sha": "abc123", "backend": "clojure-nrepl"}
+).encode("utf-8")
+
+
 # ---------------------------------------------------------------------------
 # Fixtures
 # ---------------------------------------------------------------------------
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def config() -> EngineConfig:
     return EngineConfig(
         root_model="anthropic/claude-opus-4-6",
@@ -47,38 +65,37 @@ def config() -> EngineConfig:
         threshold_tokens=50000,
         guardrails=GuardrailsConfig(
             enabled=True,
-            max_cost_per_run_usd=Decimal("10.00"),
-            warn_cost_threshold_usd=Decimal("5.00"),
+            max_cost_per_run_usd=_MAX_COST,
+            warn_cost_threshold_usd=_WARN_COST,
             max_sub_lm_calls=10,
         ),
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def backend() -> ClojureNREPLBackend:
     return ClojureNREPLBackend(nrepl_port=None)
 
 
-@pytest.fixture
-def mock_project(tmp_path: Path) -> Path:
-    """Create a mock Clojure project with source files."""
-    logic_dir = tmp_path / "src" / "nu" / "svc" / "logic"
+@pytest.fixture(scope="session")
+def _mock_project_template(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Build the mock Clojure project once per session."""
+    root = tmp_path_factory.mktemp("mock_project_template")
+    logic_dir = root / "src" / "nu" / "svc" / "logic"
     logic_dir.mkdir(parents=True)
-    model_dir = tmp_path / "src" / "nu" / "svc" / "model"
+    model_dir = root / "src" / "nu" / "svc" / "model"
     model_dir.mkdir(parents=True)
 
-    (logic_dir / "core.clj").write_text(textwrap.dedent("""\
-        (ns nu.svc.logic.core
-          (:require [nu.svc.model.data :as data]))
-        (defn process [x] (data/transform x))
-    """), encoding="utf-8")
+    (logic_dir / "core.clj").write_bytes(_CORE_CLJ)
+    (model_dir / "data.clj").write_bytes(_DATA_CLJ)
 
-    (model_dir / "data.clj").write_text(textwrap.dedent("""\
-        (ns nu.svc.model.data)
-        (defn transform [x] {:result x})
-    """), encoding="utf-8")
+    return root
 
-    return tmp_path
+
+@pytest.fixture
+def mock_project(_mock_project_template: Path) -> Path:
+    """The shared mock Clojure project, read-only: analyses write to output_dir."""
+    return _mock_project_template
 
 
 @pytest.fixture
@@ -94,36 +111,66 @@ def output_dir_with_metadata(output_dir: Path, mock_project: Path) -> Path:
     """Output directory with existing analysis metadata."""
     metadata_dir = output_dir / "projects" / mock_project.name
     metadata_dir.mkdir(parents=True)
-    metadata = {"commit_sha": "abc123", "backend": "clojure-nrepl"}
-    (metadata_dir / "analysis_metadata.json").write_text(
-        json.dumps(metadata), encoding="utf-8"
-    )
+    (metadata_dir / "analysis_metadata.json").write_bytes(_METADATA_BYTES)
     return output_dir
 
 
 @pytest.fixture
 def analyzer(
-    mock_project: Path, backend: ClojureNREPLBackend, config: EngineConfig, output_dir: Path
+    request: pytest.FixtureRequest,
+    mock_project: Path, backend: ClojureNREPLBackend, config: EngineConfig,
 ) -> CodebaseAnalyzer:
-    return CodebaseAnalyzer(mock_project, backend, config, output_dir=output_dir)
+    """Analyzer over mock_project writing to output_dir.
+
+    Parametrize indirectly with another output fixture name (e.g.
+    "output_dir_with_metadata") to start from a different output state.
+    """
+    output = request.getfixturevalue(getattr(request, "param", "output_dir"))
+    return CodebaseAnalyzer(mock_project, backend, config, output_dir=output)
+
+
+_SUBPROCESS_RUN = "knowledge.recipes.codebase_analysis.orchestrator.subprocess.run"
+
+
+@pytest.fixture
+def mock_subprocess(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """Replace the orchestrator's subprocess.run; tests set return_value or side_effect."""
+    mock_run = MagicMock()
+    monkeypatch.setattr(_SUBPROCESS_RUN, mock_run)
+    return mock_run
 
 
-def _make_engine_result(status: str = "completed", **kwargs) -> EngineResult:
-    """Helper to create mock EngineResult."""
+def _fake_run(returncode: int = 0, stdout: str = "") -> SimpleNamespace:
+    """Stand-in for a subprocess.CompletedProcess."""
+    return SimpleNamespace(returncode=returncode, stdout=stdout)
+
+
+def _make_staleness(status: StalenessStatus, **kwargs) -> StalenessResult:
+    """Helper to create StalenessResult (no prior SHA, nothing changed by default)."""
     defaults = {
-        "iterations": 1,
-        "gate_decision": GateDecision(
-            fan_out=False, token_count=100, stage="threshold", reason="test"
-        ),
-        "cost_summary": {"total_cost_usd": "0.50"},
-        "output": "analysis done",
+        "last_sha": None,
+        "current_sha": "abc",
+        "changed_files": [],
+        "changed_namespaces": [],
     }
     defaults.update(kwargs)
-    return EngineResult(status=status, **defaults)
+    return StalenessResult(status=status, **defaults)
+
+
+_DEFAULT_PIPELINE_RESULT = PipelineResult(
+    status="completed",
+    analyses=[],
+    validation_errors=[],
+    cost_summary={"total_cost_usd": "0.50"},
+    groups_total=1,
+    groups_succeeded=1,
+)
 
 
 def _make_pipeline_result(status: str = "completed", **kwargs) -> PipelineResult:
-    """Helper to create mock PipelineResult."""
+    """Helper to create mock PipelineResult; the shared default unless overridden."""
+    if status == "completed" and not kwargs:
+        return _DEFAULT_PIPELINE_RESULT
     defaults = {
         "analyses": [],
         "validation_errors": [],
@@ -151,72 +198,55 @@ class TestCheckStaleness:
         result = analyzer.check_staleness()
         assert result.status == StalenessStatus.NO_BEADS
 
-    def test_no_metadata_file(
-        self, mock_project: Path, backend: ClojureNREPLBackend, config: EngineConfig,
-        output_dir: Path,
-    ) -> None:
-        analyzer = CodebaseAnalyzer(mock_project, backend, config, output_dir=output_dir)
+    def test_no_metadata_file(self, analyzer: CodebaseAnalyzer) -> None:
         result = analyzer.check_staleness()
         assert result.status == StalenessStatus.NO_PRIOR_ANALYSIS
 
+    @pytest.mark.parametrize("analyzer", ["output_dir_with_metadata"], indirect=True)
     @patch("knowledge.recipes.codebase_analysis.orchestrator._get_current_sha")
     def test_same_sha_is_fresh(
-        self, mock_sha: MagicMock,
-        mock_project: Path, backend: ClojureNREPLBackend, config: EngineConfig,
-        output_dir_with_metadata: Path,
+        self, mock_sha: MagicMock, analyzer: CodebaseAnalyzer
     ) -> None:
         mock_sha.return_value = "abc123"
-        analyzer = CodebaseAnalyzer(
-            mock_project, backend, config, output_dir=output_dir_with_metadata
-        )
         result = analyzer.check_staleness()
         assert result.status == StalenessStatus.FRESH
         assert result.last_sha == "abc123"
         assert result.current_sha == "abc123"
 
+    @pytest.mark.parametrize("analyzer", ["output_dir_with_metadata"], indirect=True)
     @patch("knowledge.recipes.codebase_analysis.orchestrator._get_changed_files")
     @patch("knowledge.recipes.codebase_analysis.orchestrator._get_current_sha")
     def test_different_sha_no_source_changes_is_fresh(
-        self, mock_sha: MagicMock, mock_changed: MagicMock,
-        mock_project: Path, backend: ClojureNREPLBackend, config: EngineConfig,
-        output_dir_with_metadata: Path,
+        self, mock_sha: MagicMock, mock_changed: MagicMock, analyzer: CodebaseAnalyzer
     ) -> None:
         mock_sha.return_value = "def456"
         mock_changed.return_value = ["README.md", "docs/notes.txt"]  # no .clj files
-        analyzer = CodebaseAnalyzer(
-            mock_project, backend, config, output_dir=output_dir_with_metadata
-        )
         result = analyzer.check_staleness()
         assert result.status == StalenessStatus.FRESH
         assert result.changed_namespaces == []
 
+    @pytest.mark.benchmark
+    @pytest.mark.parametrize("analyzer", ["output_dir_with_metadata"], indirect=True)
     @patch("knowledge.recipes.codebase_analysis.orchestrator._get_changed_files")
     @patch("knowledge.recipes.codebase_analysis.orchestrator._get_current_sha")
     def test_different_sha_with_source_changes_is_stale(
-        self, mock_sha: MagicMock, mock_changed: MagicMock,
-        mock_project: Path, backend: ClojureNREPLBackend, config: EngineConfig,
-        output_dir_with_metadata: Path,
+        self, mock_sha: MagicMock, mock_changed: MagicMock, analyzer: CodebaseAnalyzer
     ) -> None:
         mock_sha.return_value = "def456"
         # Return a path that matches a namespace in the project
         mock_changed.return_value = ["src/nu/svc/logic/core.clj"]
-        analyzer = CodebaseAnalyzer(
-            mock_project, backend, config, output_dir=output_dir_with_metadata
-        )
         result = analyzer.check_staleness()
         assert result.status == StalenessStatus.STALE
         assert len(result.changed_namespaces) > 0
 
     def test_corrupted_metadata_treated_as_no_prior(
-        self, mock_project: Path, backend: ClojureNREPLBackend, config: EngineConfig,
-        output_dir: Path,
+        self, analyzer: CodebaseAnalyzer, mock_project: Path, output_dir: Path,
     ) -> None:
         metadata_dir = output_dir / "projects" / mock_project.name
         metadata_dir.mkdir(parents=True)
         (metadata_dir / "analysis_metadata.json").write_text(
             "not valid json", encoding="utf-8"
         )
-        analyzer = CodebaseAnalyzer(mock_project, backend, config, output_dir=output_dir)
         result = analyzer.check_staleness()
         assert result.status == StalenessStatus.NO_PRIOR_ANALYSIS
 
@@ -228,92 +258,62 @@ class TestCheckStaleness:
 
 class TestRun:
 
-    @patch.object(CodebaseAnalyzer, "check_staleness")
-    def test_skips_fresh_analysis(
-        self, mock_staleness: MagicMock, analyzer: CodebaseAnalyzer
-    ) -> None:
-        mock_staleness.return_value = StalenessResult(
-            status=StalenessStatus.FRESH,
-            last_sha="abc", current_sha="abc",
-            changed_files=[], changed_namespaces=[],
-        )
+    @pytest.fixture(autouse=True)
+    def _patch_pipeline(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Stub staleness and the pipeline; tests set their return values."""
+        self.mock_staleness = MagicMock()
+        self.mock_pipeline = MagicMock(return_value=_make_pipeline_result())
+        monkeypatch.setattr(CodebaseAnalyzer, "check_staleness", self.mock_staleness)
+        monkeypatch.setattr(PipelineRunner, "run", self.mock_pipeline)
+
+    def test_skips_fresh_analysis(self, analyzer: CodebaseAnalyzer) -> None:
+        self.mock_staleness.return_value = _make_staleness(StalenessStatus.FRESH, last_sha="abc")
         result = analyzer.run()
         assert result.status == "skipped_fresh"
         assert result.engine_result is None
 
-    @patch.object(CodebaseAnalyzer, "check_staleness")
-    @patch.object(PipelineRunner, "run")
-    def test_force_overrides_fresh(
-        self, mock_pipeline: MagicMock, mock_staleness: MagicMock, analyzer: CodebaseAnalyzer
-    ) -> None:
-        mock_staleness.return_value = StalenessResult(
-            status=StalenessStatus.FRESH,
-            last_sha="abc", current_sha="abc",
-            changed_files=[], changed_namespaces=[],
-        )
-        mock_pipeline.return_value = _make_pipeline_result()
-        result = analyzer.run(force=True)
-        assert result.status == "completed"
-        mock_pipeline.assert_called_once()
-
-    @patch.object(CodebaseAnalyzer, "check_staleness")
-    @patch.object(PipelineRunner, "run")
-    def test_runs_on_no_prior_analysis(
-        self, mock_pipeline: MagicMock, mock_staleness: MagicMock, analyzer: CodebaseAnalyzer
-    ) -> None:
-        mock_staleness.return_value = StalenessResult(
-            status=StalenessStatus.NO_PRIOR_ANALYSIS,
-            last_sha=None, current_sha="abc",
-            changed_files=[], changed_namespaces=[],
-        )
-        mock_pipeline.return_value = _make_pipeline_result()
-        result = analyzer.run()
-        assert result.status == "completed"
-
-    @patch.object(CodebaseAnalyzer, "check_staleness")
-    @patch.object(PipelineRunner, "run")
-    def test_runs_on_stale(
-        self, mock_pipeline: MagicMock, mock_staleness: MagicMock, analyzer: CodebaseAnalyzer
+    @pytest.mark.benchmark
+    @pytest.mark.parametrize(
+        ("staleness", "run_kwargs"),
+        [
+            pytest.param(
+                _make_staleness(StalenessStatus.FRESH, last_sha="abc"),
+                {"force": True},
+                id="force_overrides_fresh",
+            ),
+            pytest.param(
+                _make_staleness(StalenessStatus.NO_PRIOR_ANALYSIS),
+                {},
+                id="no_prior_analysis",
+            ),
+            pytest.param(
+                _make_staleness(
+                    StalenessStatus.STALE, last_sha="abc", current_sha="def",
+                    changed_files=["src/core.clj"], changed_namespaces=["nu.svc.logic.core"],
+                ),
+                {},
+                id="stale",
+            ),
+            pytest.param(
+                _make_staleness(StalenessStatus.NO_BEADS),
+                {"mode": "security"},
+                id="security_mode",
+            ),
+        ],
+    )
+    def test_runs_pipeline(
+        self, analyzer: CodebaseAnalyzer, staleness: StalenessResult, run_kwargs: dict
     ) -> None:
-        mock_staleness.return_value = StalenessResult(
-            status=StalenessStatus.STALE,
-            last_sha="abc", current_sha="def",
-            changed_files=["src/core.clj"], changed_namespaces=["nu.svc.logic.core"],
-        )
-        mock_pipeline.return_value = _make_pipeline_result()
-        result = analyzer.run()
+        self.mock_staleness.return_value = staleness
+        result = analyzer.run(**run_kwargs)
         assert result.status == "completed"
+        self.mock_pipeline.assert_called_once()
 
-    @patch.object(CodebaseAnalyzer, "check_staleness")
-    @patch.object(PipelineRunner, "run")
-    def test_captures_namespace_count(
-        self, mock_pipeline: MagicMock, mock_staleness: MagicMock, analyzer: CodebaseAnalyzer
-    ) -> None:
-        mock_staleness.return_value = StalenessResult(
-            status=StalenessStatus.NO_PRIOR_ANALYSIS,
-            last_sha=None, current_sha="abc",
-            changed_files=[], changed_namespaces=[],
-        )
-        mock_pipeline.return_value = _make_pipeline_result()
+    def test_captures_namespace_count(self, analyzer: CodebaseAnalyzer) -> None:
+        self.mock_staleness.return_value = _make_staleness(StalenessStatus.NO_PRIOR_ANALYSIS)
         result = analyzer.run()
         assert result.namespace_count == 2  # mock_project has 2 namespaces
 
-    @patch.object(CodebaseAnalyzer, "check_staleness")
-    @patch.object(PipelineRunner, "run")
-    def test_passes_mode_to_prompt(
-        self, mock_pipeline: MagicMock, mock_staleness: MagicMock, analyzer: CodebaseAnalyzer
-    ) -> None:
-        mock_staleness.return_value = StalenessResult(
-            status=StalenessStatus.NO_BEADS,
-            last_sha=None, current_sha="abc",
-            changed_files=[], changed_namespaces=[],
-        )
-        mock_pipeline.return_value = _make_pipeline_result()
-        result = analyzer.run(mode="security")
-        # Verify pipeline was called (prompt building with mode happens internally)
-        mock_pipeline.assert_called_once()
-        assert result.status == "completed"
-
 
 # ---------------------------------------------------------------------------
 # Store metadata
@@ -323,10 +323,8 @@ class TestRun:
 class TestStoreAnalysisMetadata:
 
     def test_creates_metadata_in_output_dir(
-        self, mock_project: Path, backend: ClojureNREPLBackend, config: EngineConfig,
-        output_dir: Path,
+        self, analyzer: CodebaseAnalyzer, mock_project: Path, output_dir: Path
     ) -> None:
-        analyzer = CodebaseAnalyzer(mock_project, backend, config, output_dir=output_dir)
         analyzer.store_analysis_metadata("sha-123")
 
         metadata_path = (
@@ -334,30 +332,25 @@ class TestStoreAnalysisMetadata:
         )
         assert metadata_path.exists()
 
-        metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
+        metadata = json.loads(metadata_path.read_bytes())
         assert metadata["commit_sha"] == "sha-123"
         assert metadata["backend"] == "clojure-nrepl"
 
+    @pytest.mark.parametrize("analyzer", ["output_dir_with_metadata"], indirect=True)
     def test_overwrites_existing_metadata(
-        self, mock_project: Path, backend: ClojureNREPLBackend, config: EngineConfig,
-        output_dir_with_metadata: Path,
+        self, analyzer: CodebaseAnalyzer, mock_project: Path, output_dir_with_metadata: Path
     ) -> None:
-        analyzer = CodebaseAnalyzer(
-            mock_project, backend, config, output_dir=output_dir_with_metadata
-        )
         analyzer.store_analysis_metadata("new-sha")
 
         metadata_path = (
             output_dir_with_metadata / "projects" / mock_project.name / "analysis_metadata.json"
         )
-        metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
+        metadata = json.loads(metadata_path.read_bytes())
         assert metadata["commit_sha"] == "new-sha"
 
     def test_creates_project_dir_if_missing(
-        self, mock_project: Path, backend: ClojureNREPLBackend, config: EngineConfig,
-        output_dir: Path,
+        self, analyzer: CodebaseAnalyzer, mock_project: Path, output_dir: Path
     ) -> None:
-        analyzer = CodebaseAnalyzer(mock_project, backend, config, output_dir=output_dir)
         analyzer.store_analysis_metadata("sha-456")
 
         project_out = output_dir / "projects" / mock_project.name
@@ -372,11 +365,9 @@ class TestStoreAnalysisMetadata:
 class TestTargetProjectNotModified:
 
     def test_store_metadata_does_not_write_to_project_dir(
-        self, mock_project: Path, backend: ClojureNREPLBackend, config: EngineConfig,
-        output_dir: Path,
+        self, analyzer: CodebaseAnalyzer, mock_project: Path, output_dir: Path
     ) -> None:
         """The target project directory must remain untouched — no .beads/ created."""
-        analyzer = CodebaseAnalyzer(mock_project, backend, config, output_dir=output_dir)
         analyzer.store_analysis_metadata("sha-789")
 
         beads_in_project = mock_project / ".beads"
@@ -392,50 +383,32 @@ class TestTargetProjectNotModified:
 
 class TestVerifyGraph:
 
-    @patch("knowledge.recipes.codebase_analysis.orchestrator.subprocess.run")
     def test_returns_true_when_beads_exist(
-        self, mock_run: MagicMock,
-        mock_project: Path, backend: ClojureNREPLBackend, config: EngineConfig,
-        output_dir: Path,
+        self, mock_subprocess: MagicMock, analyzer: CodebaseAnalyzer
     ) -> None:
-        mock_run.return_value = MagicMock(
-            returncode=0, stdout="bead-1\nbead-2\n"
-        )
-        analyzer = CodebaseAnalyzer(mock_project, backend, config, output_dir=output_dir)
+        mock_subprocess.return_value = _fake_run(0, "bead-1\nbead-2\n")
         assert analyzer.verify_graph() is True
         # Verify --db flag is used instead of cwd
-        args = mock_run.call_args[0][0]
-        assert "--db" in args
-        assert "cwd" not in mock_run.call_args[1]
+        args, kwargs = mock_subprocess.call_args
+        assert "--db" in args[0]
+        assert "cwd" not in kwargs
 
-    @patch("knowledge.recipes.codebase_analysis.orchestrator.subprocess.run")
     def test_returns_false_when_no_beads(
-        self, mock_run: MagicMock,
-        mock_project: Path, backend: ClojureNREPLBackend, config: EngineConfig,
-        output_dir: Path,
+        self, mock_subprocess: MagicMock, analyzer: CodebaseAnalyzer
     ) -> None:
-        mock_run.return_value = MagicMock(returncode=0, stdout="")
-        analyzer = CodebaseAnalyzer(mock_project, backend, config, output_dir=output_dir)
+        mock_subprocess.return_value = _fake_run(0, "")
         assert analyzer.verify_graph() is False
 
-    @patch("knowledge.recipes.codebase_analysis.orchestrator.subprocess.run")
     def test_returns_false_on_bd_failure(
-        self, mock_run: MagicMock,
-        mock_project: Path, backend: ClojureNREPLBackend, config: EngineConfig,
-        output_dir: Path,
+        self, mock_subprocess: MagicMock, analyzer: CodebaseAnalyzer
     ) -> None:
-        mock_run.return_value = MagicMock(returncode=1, stdout="")
-        analyzer = CodebaseAnalyzer(mock_project, backend, config, output_dir=output_dir)
+        mock_subprocess.return_value = _fake_run(1, "")
         assert analyzer.verify_graph() is False
 
-    @patch("knowledge.recipes.codebase_analysis.orchestrator.subprocess.run")
     def test_returns_false_on_timeout(
-        self, mock_run: MagicMock,
-        mock_project: Path, backend: ClojureNREPLBackend, config: EngineConfig,
-        output_dir: Path,
+        self, mock_subprocess: MagicMock, analyzer: CodebaseAnalyzer
     ) -> None:
-        mock_run.side_effect = subprocess.TimeoutExpired(cmd="bd", timeout=10)
-        analyzer = CodebaseAnalyzer(mock_project, backend, config, output_dir=output_dir)
+        mock_subprocess.side_effect = subprocess.TimeoutExpired(cmd="bd", timeout=10)
         assert analyzer.verify_graph() is False
 
 
@@ -446,30 +419,24 @@ class TestVerifyGraph:
 
 class TestGetCurrentSha:
 
-    @patch("knowledge.recipes.codebase_analysis.orchestrator.subprocess.run")
-    def test_returns_sha(self, mock_run: MagicMock, tmp_path: Path) -> None:
-        mock_run.return_value = MagicMock(returncode=0, stdout="abc123\n")
+    def test_returns_sha(self, mock_subprocess: MagicMock, tmp_path: Path) -> None:
+        mock_subprocess.return_value = _fake_run(0, "abc123\n")
         assert _get_current_sha(tmp_path) == "abc123"
 
-    @patch("knowledge.recipes.codebase_analysis.orchestrator.subprocess.run")
-    def test_returns_none_on_failure(self, mock_run: MagicMock, tmp_path: Path) -> None:
-        mock_run.return_value = MagicMock(returncode=1, stdout="")
+    def test_returns_none_on_failure(self, mock_subprocess: MagicMock, tmp_path: Path) -> None:
+        mock_subprocess.return_value = _fake_run(1, "")
         assert _get_current_sha(tmp_path) is None
 
 
 class TestGetChangedFiles:
 
-    @patch("knowledge.recipes.codebase_analysis.orchestrator.subprocess.run")
-    def test_returns_changed_files(self, mock_run: MagicMock, tmp_path: Path) -> None:
-        mock_run.return_value = MagicMock(
-            returncode=0, stdout="src/core.clj\nsrc/model.clj\n"
-        )
+    def test_returns_changed_files(self, mock_subprocess: MagicMock, tmp_path: Path) -> None:
+        mock_subprocess.return_value = _fake_run(0, "src/core.clj\nsrc/model.clj\n")
         result = _get_changed_files(tmp_path, "abc", "def")
         assert result == ["src/core.clj", "src/model.clj"]
 
-    @patch("knowledge.recipes.codebase_analysis.orchestrator.subprocess.run")
-    def test_returns_empty_on_failure(self, mock_run: MagicMock, tmp_path: Path) -> None:
-        mock_run.return_value = MagicMock(returncode=1, stdout="")
+    def test_returns_empty_on_failure(self, mock_subprocess: MagicMock, tmp_path: Path) -> None:
+        mock_subprocess.return_value = _fake_run(1, "")
         assert _get_changed_files(tmp_path, "abc", "def") == []
 
 
@@ -483,7 +450,9 @@ class TestMapFilesToNamespaces:
     def test_empty_changes(self, mock_project: Path, backend: ClojureNREPLBackend) -> None:
         assert _map_files_to_namespaces([], mock_project, backend) == []
 
-    def test_non_source_files_ignored(self, mock_project: Path, backend: ClojureNREPLBackend) -> None:
+    def test_non_source_files_ignored(
+        self, mock_project: Path, backend: ClojureNREPLBackend
+    ) -> None:
         changed = ["README.md", "docs/notes.txt"]
         assert _map_files_to_namespaces(changed, mock_project, backend) == []
 
@@ -496,11 +465,7 @@ class TestMapFilesToNamespaces:
 class TestDataclasses:
 
     def test_staleness_result_frozen(self) -> None:
-        result = StalenessResult(
-            status=StalenessStatus.FRESH,
-            last_sha="abc", current_sha="abc",
-            changed_files=[], changed_namespaces=[],
-        )
+        result = _make_staleness(StalenessStatus.FRESH, last_sha="abc")
         with pytest.raises(AttributeError):
             result.status = StalenessStatus.STALE  # type: ignore[misc]
 
@@ -508,11 +473,7 @@ class TestDataclasses:
         result = AnalysisResult(
             status="completed",
             engine_result=None,
-            staleness=StalenessResult(
-                status=StalenessStatus.FRESH,
-                last_sha="abc", current_sha="abc",
-                changed_files=[], changed_namespaces=[],
-            ),
+            staleness=_make_staleness(StalenessStatus.FRESH, last_sha="abc"),
             namespace_count=0,
             commit_sha="abc",
         )
@@ -4,13 +4,30 @@ from __future__ import annotations
 
 import pytest
 
+from knowledge.backends.base import NamespaceInfo
+from knowledge.engine.chunking import FlowGroup
 from knowledge.recipes.codebase_analysis.prompts import (
     LAYER_PROMPTS,
     build_analysis_prompt,
+    build_flow_group_prompt,
     get_layer_prompt,
 )
 
 
+def _ns(name: str) -> NamespaceInfo:
+    return NamespaceInfo(
+        path=f"/src/{name}.clj", name=name, requires=[], functions=[],
+        layer="logic", has_side_effects=False,
+    )
+
+
+def _group(name: str, *ns_names: str) -> FlowGroup:
+    return FlowGroup(
+        name=name, namespaces=[_ns(n) for n in ns_names],
+        entry_points=list(ns_names), exit_points=list(ns_names), internal_deps={},
+    )
+
+
 class TestBuildAnalysisPrompt:
 
     def test_includes_project_name(self) -> None:
@@ -53,11 +70,11 @@ class TestBuildAnalysisPrompt:
 
 class TestGetLayerPrompt:
 
-    def test_known_layers(self) -> None:
-        for layer in ("logic", "model", "controller", "adapter", "wire"):
-            prompt = get_layer_prompt(layer)
-            assert "{namespace}" in prompt
-            assert "{source}" in prompt
+    @pytest.mark.parametrize("layer", ["logic", "model", "controller", "adapter", "wire"])
+    def test_known_layers(self, layer: str) -> None:
+        prompt = get_layer_prompt(layer)
+        assert "{namespace}" in prompt
+        assert "{source}" in prompt
 
     def test_logic_is_deep(self) -> None:
         prompt = get_layer_prompt("logic")
@@ -73,7 +90,36 @@ class TestGetLayerPrompt:
         assert "{namespace}" in prompt
         assert "{source}" in prompt
 
-    def test_all_layer_prompts_have_placeholders(self) -> None:
-        for layer, prompt in LAYER_PROMPTS.items():
-            assert "{namespace}" in prompt, f"{layer} missing {{namespace}}"
-            assert "{source}" in prompt, f"{layer} missing {{source}}"
+    @pytest.mark.parametrize(
+        ("layer", "prompt"), list(LAYER_PROMPTS.items()), ids=list(LAYER_PROMPTS)
+    )
+    def test_all_layer_prompts_have_placeholders(self, layer: str, prompt: str) -> None:
+        assert "{namespace}" in prompt and "{source}" in prompt, (
+            f"{layer} missing {{namespace}} or {{source}}"
+        )
+
+
+class TestBuildFlowGroupPrompt:
+
+    def test_includes_group_source(self) -> None:
+        prompt = build_flow_group_prompt(_group("flow-a", "svc.a"), {"svc.a": "(ns svc.a)"})
+        assert "## Flow Group: flow-a" in prompt
+        assert "(ns svc.a)" in prompt
+
+    def test_missing_source_marked(self) -> None:
+        prompt = build_flow_group_prompt(_group("flow-a", "svc.a"), {})
+        assert "(source not available)" in prompt
+
+    def test_static_prefix_identical_across_groups(self) -> None:
+        sources = {"svc.a": "(ns svc.a)", "svc.b": "(ns svc.b)"}
+        prompt_a = build_flow_group_prompt(_group("flow-a", "svc.a"), sources)
+        prompt_b = build_flow_group_prompt(_group("flow-b", "svc.b"), sources)
+        prefix_a = prompt_a.split("## Flow Group:")[0]
+        prefix_b = prompt_b.split("## Flow Group:")[0]
+        assert prefix_a == prefix_b
+        assert "## Required Output Format" in prefix_a
+
+    def test_security_mode_adds_findings_instructions(self) -> None:
+        prompt = build_flow_group_prompt(_group("flow-a", "svc.a"), {}, mode="security")
+        assert "security posture" in prompt
+        assert "Security findings" in prompt